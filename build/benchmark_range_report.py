@@ -0,0 +1,80 @@
+"""Pages per second of the streaming yearly sales report.
+
+Fills a throwaway database with --sales sales spread over one year, builds the yearly
+report from it and prints pages, pages per second and, with --trace-memory, the peak
+of Python memory while rendering. Run it with two --sales values: the rate and the peak
+should stay about the same. build/check_report_memory.py checks the peak.
+
+    python build/benchmark_range_report.py [--sales 100000] [--trace-memory]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, project_root)
+
+import database.connection as connection
+from services.auth_service import AuthService
+from services.sales_service import SalesService
+from services.report_service import ReportService
+from services.export_service import ExportJob
+
+YEAR = 2025
+
+
+def generated_sales(count):
+    """(doc, amount, sale_datetime) tuples evenly spread over YEAR"""
+    step = timedelta(days=365) / count
+    start = datetime(YEAR, 1, 1, 8, 0)
+    for n in range(count):
+        yield f"F{n:07d}", 10 + (n * 37) % 990 + 0.99, start + step * n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sales', type=int, default=100000)
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="report peak Python memory, rendering gets several times slower")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="salesapp_bench_")
+    try:
+        connection.DB_FILE = os.path.join(work_dir, 'bench.db')
+        db = connection.Database()
+        auth_service = AuthService(db)
+        sales_service = SalesService(db)
+        auth_service.register_user("bench", "bench", False)
+        user = auth_service.login_user("bench")
+
+        print(f"Inserting {args.sales} sales...")
+        sales_service.create_sales_bulk(generated_sales(args.sales), user)
+
+        file_path = os.path.join(work_dir, 'year.pdf')
+        job = ExportJob(f"Year {YEAR}", file_path, None)
+        if args.trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        ReportService(sales_service).build_year_report(job, file_path, user, YEAR)
+        elapsed = time.perf_counter() - started
+
+        print(f"{args.sales} sales, {job.pages} pages in {elapsed:.2f} s: "
+              f"{job.pages / elapsed:.1f} pages/s, {args.sales / elapsed:.0f} sales/s, "
+              f"{os.path.getsize(file_path) / 1024 / 1024:.1f} MB")
+        if args.trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"Peak traced memory: {peak / 1024 / 1024:.1f} MB")
+        db.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -70,6 +70,9 @@ build_args = [
     '--hidden-import=reportlab.platypus.frames',
     '--hidden-import=reportlab.platypus.pagebreak',
     '--hidden-import=reportlab.rl_config',
+
+    # PDF merging of report parts
+    '--hidden-import=pypdf',
     
     # Standard Library modules that might be missed
     '--hidden-import=os',
@@ -82,19 +85,35 @@ build_args = [
     # Your custom modules (to ensure they're included)
     '--hidden-import=database',
     '--hidden-import=database.connection',
+    '--hidden-import=database.migrations',
+    '--hidden-import=database.instrumentation',
+    '--hidden-import=database.fts',
     '--hidden-import=services',
     '--hidden-import=services.auth_service',
     '--hidden-import=services.sales_service', 
+    '--hidden-import=services.sales_import_service',
     '--hidden-import=services.offer_service',
+    '--hidden-import=services.background_service',
+    '--hidden-import=services.cached_offer_service',
+    '--hidden-import=services.export_service',
+    '--hidden-import=services.report_service',
+    '--hidden-import=services.offer_document_service',
+    '--hidden-import=services.cached_offer_document_service',
+    '--hidden-import=services.batch_export_service',
     '--hidden-import=models',
     '--hidden-import=models.user',
     '--hidden-import=models.sale',
     '--hidden-import=models.offer',
+    '--hidden-import=models.offer_summary',
     '--hidden-import=ui',
     '--hidden-import=ui.login_window',
     '--hidden-import=ui.dashboard_window',
     '--hidden-import=ui.offer_window',
+    '--hidden-import=ui.future_dispatcher',
+    '--hidden-import=ui.virtual_table',
+    '--hidden-import=ui.export_progress',
     '--hidden-import=utils.resource_path',
+    '--hidden-import=utils.pdf_merge',
     
 
 
@@ -0,0 +1,153 @@
+"""Import-time budget for startup, meant to run before a release build.
+
+Every module measured here is imported in a fresh interpreter with -X importtime, a
+few times over, and the median cumulative time is compared with its budget. The run
+also fails when a module that should only load on first use (ReportLab, the offer
+window, the PDF report code) is pulled in at startup. Those imports cost the most in
+the PyInstaller onefile build, where every module is unpacked and loaded from the
+archive.
+
+Budgets are the medians recorded in import_time_baseline.json for this platform times
+--margin. Both sides are scaled by the import time of customtkinter, measured in the
+same way on the recording machine and on this one, so a slower build machine does not
+fail the check while anything the app itself adds at startup does. A platform without
+a recorded baseline fails the check. Record one, or a new one after an intended change
+to startup imports, on that platform with --record.
+
+    python build/check_import_time.py [--runs 5] [--margin 1.3] [--record]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules measured against the baseline. "main" is cold start up to the login window,
+# "ui.dashboard_window" the dashboard on its own; both cumulative times include
+# customtkinter and everything else they import.
+MEASURED_MODULES = ('main', 'ui.dashboard_window')
+
+# Third-party import both measured modules are built on, used to scale the baseline
+# to the speed of the machine running the check
+REFERENCE_MODULE = 'customtkinter'
+
+DEFAULT_MARGIN = 1.3
+
+# Modules that must not be imported by any of the modules above
+DEFERRED_MODULES = (
+    'reportlab',
+    'pypdf',
+    'ui.offer_window',
+    'services.report_service',
+    'services.offer_document_service',
+    'services.cached_offer_document_service',
+    'services.batch_export_service',
+    'utils.pdf_merge',
+)
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+BASELINE_FILE = os.path.join(current_dir, 'import_time_baseline.json')
+
+
+def measure(module):
+    """Import module in a fresh interpreter, returns (cumulative ms, imported module names)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=project_root,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    cumulative_us = None
+    imported = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        imported.append(name)
+        if name == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000, imported
+
+
+def measure_median(module, runs):
+    """Median cumulative ms over runs fresh imports, with the modules the last one imported"""
+    # the first run also compiles .pyc files, it is not counted
+    measure(module)
+    timings = []
+    for _ in range(runs):
+        elapsed_ms, imported = measure(module)
+        timings.append(elapsed_ms)
+    return statistics.median(timings), min(timings), max(timings), imported
+
+
+def load_baselines():
+    try:
+        with open(BASELINE_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def record(runs):
+    baselines = load_baselines()
+    entry = {REFERENCE_MODULE: round(measure_median(REFERENCE_MODULE, runs)[0], 1)}
+    for module in MEASURED_MODULES:
+        entry[module] = round(measure_median(module, runs)[0], 1)
+    baselines[sys.platform] = entry
+    with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+    print(f"Recorded {sys.platform} baseline: {entry}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--margin', type=float, default=DEFAULT_MARGIN,
+                        help="allowed slowdown over the baseline")
+    parser.add_argument('--record', action='store_true',
+                        help="store this machine's timings as the baseline for its platform")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.runs)
+        return
+
+    baseline = load_baselines().get(sys.platform)
+    if baseline is None:
+        print(f"FAIL no {sys.platform} baseline in {BASELINE_FILE}, "
+              f"run build/check_import_time.py --record on {sys.platform} and commit the file")
+        sys.exit(1)
+
+    reference_ms = measure_median(REFERENCE_MODULE, args.runs)[0]
+    speed = reference_ms / baseline[REFERENCE_MODULE]
+    print(f"{REFERENCE_MODULE}: {reference_ms:.1f} ms, {speed:.2f}x the baseline machine")
+
+    failed = False
+    for module in MEASURED_MODULES:
+        budget_ms = baseline[module] * speed * args.margin
+        median_ms, min_ms, max_ms, imported = measure_median(module, args.runs)
+
+        eager = [
+            deferred for deferred in DEFERRED_MODULES
+            if any(name == deferred or name.startswith(deferred + '.') for name in imported)
+        ]
+        status = "OK" if median_ms <= budget_ms and not eager else "FAIL"
+        print(f"{status:4} {module}: {median_ms:.1f} ms (budget {budget_ms:.0f} ms, "
+              f"min {min_ms:.1f}, max {max_ms:.1f})")
+        if eager:
+            print(f"     imported at startup but should load on first use: {', '.join(eager)}")
+        failed = failed or status == "FAIL"
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Flat-memory check for the streamed yearly sales report, meant to run before a release.
+
+The yearly report is built twice, from throwaway databases with --sales sales and with
+--scale times as many, and the peak of Python memory while rendering each is compared.
+The report is built in parts of RANGE_PART_ROWS sales that are joined at the end, so
+the peak must not grow with the number of sales; the check fails when the larger run
+peaks more than --tolerance above the smaller one. Parts are made smaller here than in
+the app so both runs are split into several of them and the check stays quick.
+
+    python build/check_report_memory.py [--sales 4000] [--scale 4] [--part-rows 1000] [--tolerance 1.25]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, project_root)
+
+import database.connection as connection
+import services.report_service as report_service
+from services.auth_service import AuthService
+from services.sales_service import SalesService
+from services.export_service import ExportJob
+from benchmark_range_report import generated_sales, YEAR
+
+
+def peak_memory(sales):
+    """Peak traced memory in bytes while building the yearly report of sales sales, with its page count"""
+    work_dir = tempfile.mkdtemp(prefix="salesapp_memory_")
+    try:
+        connection.DB_FILE = os.path.join(work_dir, 'check.db')
+        db = connection.Database()
+        auth_service = AuthService(db)
+        sales_service = SalesService(db)
+        auth_service.register_user("check", "check", False)
+        user = auth_service.login_user("check")
+        sales_service.create_sales_bulk(generated_sales(sales), user)
+
+        file_path = os.path.join(work_dir, 'year.pdf')
+        job = ExportJob(f"Year {YEAR}", file_path, None)
+        tracemalloc.start()
+        try:
+            report_service.ReportService(sales_service).build_year_report(job, file_path, user, YEAR)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        db.close()
+        return peak, job.pages
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sales', type=int, default=4000)
+    parser.add_argument('--scale', type=int, default=4)
+    parser.add_argument('--part-rows', type=int, default=1000,
+                        help="sales per report part, RANGE_PART_ROWS in the app")
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help="allowed growth of the peak from the smaller run to the larger one")
+    args = parser.parse_args()
+
+    report_service.RANGE_PART_ROWS = args.part_rows
+    peaks = []
+    for sales in (args.sales, args.sales * args.scale):
+        peak, pages = peak_memory(sales)
+        peaks.append(peak)
+        print(f"{sales} sales, {pages} pages: peak {peak / 1024 / 1024:.1f} MB")
+
+    growth = peaks[1] / peaks[0]
+    status = "OK" if growth <= args.tolerance else "FAIL"
+    print(f"{status:4} peak grew {growth:.2f}x for {args.scale}x the sales (allowed {args.tolerance:.2f}x)")
+    sys.exit(0 if status == "OK" else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 import sqlite3
 import os
 import sys
+import threading
+from contextlib import contextmanager
+from database.migrations import migrate, print_progress
+from database.instrumentation import QueryStats, SLOW_QUERY_MS
 
 def get_data_dir():
     """Get the appropriate data directory for the database"""
@@ -17,6 +21,10 @@ def get_data_dir():
 DATA_DIR = get_data_dir()
 DB_FILE = os.path.join(DATA_DIR, 'sales.db')
 
+# Connections kept open for reuse after their thread has finished
+POOL_SIZE = 4
+BUSY_TIMEOUT_MS = 5000
+
 
 class Database:
     def __init__(self):
@@ -27,67 +35,83 @@ class Database:
             os.makedirs(fallback_dir, exist_ok=True)
             global DB_FILE
             DB_FILE = os.path.join(fallback_dir, 'sales.db') 
-        self.con =  sqlite3.connect(DB_FILE)
-        self.con.execute("PRAGMA foreign_keys = ON;")
-        self.create_tables()
-    
-    def create_tables(self):
-
-        table_user = """
-        CREATE TABLE if NOT EXISTS users(
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE,
-        password_hash TEXT,
-        is_admin BOOLEAN DEFAULT 0
-        )
-         """
+        self.db_file = DB_FILE
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = {}
+        self._idle = []
+        self.stats = None
+        self.migrate()
 
-        self.con.execute(table_user)
-        print("Table users CREATED")
+    @property
+    def con(self):
+        """Connection owned by the calling thread, opened or taken from the pool on first use"""
+        con = getattr(self._local, 'con', None)
+        if con is None:
+            con = self._acquire()
+            self._local.con = con
+            self._local.depth = 0
+        return con
 
-        table_sales = """
-        CREATE TABLE if NOT EXISTS sales(
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        doc TEXT,
-        amount REAL,
-        timestamp TEXT,
-        user_id INTEGER,
-        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-        )
-         """
-
-        self.con.execute(table_sales)
-        print("Table sales CREATED")
+    @contextmanager
+    def connection(self):
+        """Thread's connection as a transaction: commit on success, rollback on error.
+        Nested blocks join the outermost transaction."""
+        con = self.con
+        self._local.depth += 1
+        try:
+            yield con
+            if self._local.depth == 1:
+                con.commit()
+        except Exception:
+            if self._local.depth == 1:
+                con.rollback()
+            raise
+        finally:
+            self._local.depth -= 1
 
+    def _open(self):
+        con = sqlite3.connect(self.db_file, check_same_thread=False)
+        con.execute("PRAGMA journal_mode = WAL;")
+        con.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS};")
+        con.execute("PRAGMA synchronous = NORMAL;")
+        con.execute("PRAGMA foreign_keys = ON;")
+        if self.stats is not None:
+            con.set_trace_callback(self.stats.trace)
+        return con
 
-        table_offers = """
-        CREATE TABLE if NOT EXISTS offers(
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        cif TEXT,
-        timestamp TEXT,
-        name TEXT,
-        address TEXT,
-        phone TEXT,
-        user_id INTEGER,
-        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-        )
-         """
+    def _acquire(self):
+        with self._lock:
+            for thread in [t for t in self._connections if not t.is_alive()]:
+                con = self._connections.pop(thread)
+                con.rollback()
+                self._idle.append(con)
+            while len(self._idle) > POOL_SIZE:
+                self._idle.pop().close()
 
-        self.con.execute(table_offers)
+            con = self._idle.pop() if self._idle else self._open()
+            self._connections[threading.current_thread()] = con
+            return con
 
+    def enable_instrumentation(self, slow_query_ms=SLOW_QUERY_MS):
+        """Trace every statement on all connections into a QueryStats, returned for reporting.
+        Service methods are timed by passing the services to stats.instrument()."""
+        with self._lock:
+            if self.stats is None:
+                self.stats = QueryStats(slow_query_ms)
+            else:
+                self.stats.slow_query_ms = slow_query_ms
+            for con in list(self._connections.values()) + self._idle:
+                con.set_trace_callback(self.stats.trace)
+        return self.stats
 
-        table_offers_positions = """
-        CREATE TABLE if NOT EXISTS offers_positions(
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        offer_id INTEGER,
-        product_code TEXT,
-        product_name TEXT,
-        quantity REAL,
-        unit_price REAL,
-        vat REAL,
-        FOREIGN KEY (offer_id) REFERENCES offers(id) ON DELETE CASCADE
-        )
-         """
-        self.con.execute(table_offers_positions)
-        print("Table offers+offers_pos CREATED")
-        self.con.commit()
+    def close(self):
+        with self._lock:
+            for con in list(self._connections.values()) + self._idle:
+                con.close()
+            self._connections.clear()
+            self._idle.clear()
+        self._local = threading.local()
+    
+    def migrate(self, progress=print_progress):
+        return migrate(self.con, progress)
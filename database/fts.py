@@ -0,0 +1,18 @@
+import re
+
+SEARCH_LIMIT = 200
+
+TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def match_expression(text):
+    """FTS5 MATCH expression for text typed in a search box.
+
+    Every word becomes a quoted prefix query, so "fac 001" finds "FAC-00123" and
+    quotes or operators in the input cannot break the query. None when there is
+    nothing to search for.
+    """
+    tokens = TOKEN.findall(text)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
@@ -0,0 +1,194 @@
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+SLOW_QUERY_MS = 100
+SLOW_LOG_SIZE = 200
+# Statement texts kept per service call for the slow log, the rest are only counted
+CALL_STATEMENTS_KEPT = 50
+# Upper bounds in ms of the latency histogram buckets, the last one catches the rest
+HISTOGRAM_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, float('inf'))
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?(?![\w.])", re.IGNORECASE)
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """Statement shape with literals replaced by ?, so executions with different values group together"""
+    sql = STRING_LITERAL.sub("?", sql)
+    sql = NUMBER_LITERAL.sub("?", sql)
+    return WHITESPACE.sub(" ", sql).strip()
+
+
+class LatencyStats:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.histogram = [0] * len(HISTOGRAM_BUCKETS_MS)
+
+    def add(self, elapsed_ms, rows=None):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if rows is not None:
+            self.rows += rows
+        for i, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.histogram[i] += 1
+                break
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'rows': self.rows,
+            'histogram': dict(zip(bucket_labels(), self.histogram)),
+        }
+
+
+def bucket_labels():
+    return [f"<={b:g}ms" if b != float('inf') else f">{HISTOGRAM_BUCKETS_MS[-2]:g}ms" for b in HISTOGRAM_BUCKETS_MS]
+
+
+class QueryStats:
+    """Per-statement and per-service-call counters, latency histograms and a slow-query log.
+
+    Statements are seen through sqlite3's set_trace_callback. Every trigger program a
+    statement fires is traced again under the text of that statement, so writes to
+    sales count once per row plus once per rollup trigger. SQLite does not report when
+    a statement finishes,
+    so a statement's latency is measured up to the next traced statement or the end
+    of the service call that issued it. Statements outside an instrumented call are
+    only counted.
+    """
+
+    def __init__(self, slow_query_ms=SLOW_QUERY_MS, slow_log_size=SLOW_LOG_SIZE):
+        self.slow_query_ms = slow_query_ms
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.statements = {}
+        self.calls = {}
+        self.slow_log = deque(maxlen=slow_log_size)
+
+    def trace(self, sql):
+        now = time.perf_counter()
+        shape = normalize_sql(sql)
+        call = self.current_call()
+        with self.lock:
+            if call is not None:
+                self.close_statement(call, now)
+                call['statement_count'] += 1
+                if len(call['statements']) < CALL_STATEMENTS_KEPT:
+                    call['statements'].append(sql)
+                call['open'] = (shape, now)
+            else:
+                self.statements.setdefault(shape, LatencyStats()).count += 1
+
+    def current_call(self):
+        stack = getattr(self.local, 'calls', None)
+        return stack[-1] if stack else None
+
+    def close_statement(self, call, now):
+        if call['open'] is not None:
+            shape, started = call['open']
+            self.statements.setdefault(shape, LatencyStats()).add((now - started) * 1000)
+            call['open'] = None
+
+    def timed(self, name, method):
+        """Wrap method so its latency, rows returned and issued statements are recorded under name"""
+        def wrapper(*args, **kwargs):
+            stack = getattr(self.local, 'calls', None)
+            if stack is None:
+                stack = self.local.calls = []
+            # statements of the caller pause while the nested call runs
+            if stack:
+                with self.lock:
+                    self.close_statement(stack[-1], time.perf_counter())
+            call = {'statements': [], 'statement_count': 0, 'open': None}
+            stack.append(call)
+            result = None
+            started = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                finished = time.perf_counter()
+                stack.pop()
+                elapsed_ms = (finished - started) * 1000
+                with self.lock:
+                    self.close_statement(call, finished)
+                    self.calls.setdefault(name, LatencyStats()).add(elapsed_ms, rows_returned(result))
+                    if elapsed_ms >= self.slow_query_ms:
+                        self.slow_log.append({
+                            'at': datetime.now().isoformat(timespec='seconds'),
+                            'call': name,
+                            'elapsed_ms': round(elapsed_ms, 3),
+                            'statements': call['statements'],
+                            'statement_count': call['statement_count'],
+                        })
+                        print(f"Slow query: {name} took {elapsed_ms:.1f} ms ({call['statement_count']} statements)")
+            return result
+        wrapper.__name__ = getattr(method, '__name__', name)
+        wrapper.__doc__ = getattr(method, '__doc__', None)
+        return wrapper
+
+    def instrument(self, service, prefix=None):
+        """Replace the public methods of a service instance with timed wrappers"""
+        prefix = prefix or type(service).__name__
+        for attr in dir(service):
+            if attr.startswith('_'):
+                continue
+            method = getattr(service, attr)
+            if callable(method) and hasattr(method, '__self__'):
+                setattr(service, attr, self.timed(f"{prefix}.{attr}", method))
+        return service
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'slow_query_ms': self.slow_query_ms,
+                'calls': {name: stats.as_dict() for name, stats in self.calls.items()},
+                'statements': {sql: stats.as_dict() for sql, stats in self.statements.items()},
+                'slow_log': list(self.slow_log),
+            }
+
+    def report(self, limit=20):
+        snap = self.snapshot()
+        lines = ["=== Service calls (by total time) ==="]
+        calls = sorted(snap['calls'].items(), key=lambda kv: kv[1]['total_ms'], reverse=True)
+        for name, s in calls[:limit]:
+            lines.append(f"{s['total_ms']:10.1f} ms  {s['count']:6d}x  avg {s['avg_ms']:8.2f}  max {s['max_ms']:8.2f}  rows {s['rows']:7d}  {name}")
+        lines.append("=== Statements (by count) ===")
+        statements = sorted(snap['statements'].items(), key=lambda kv: kv[1]['count'], reverse=True)
+        for sql, s in statements[:limit]:
+            lines.append(f"{s['count']:6d}x  {s['total_ms']:10.1f} ms  max {s['max_ms']:8.2f}  {sql[:120]}")
+        lines.append(f"=== Slow calls (>= {snap['slow_query_ms']} ms): {len(snap['slow_log'])} ===")
+        for entry in snap['slow_log'][-limit:]:
+            lines.append(f"{entry['at']}  {entry['elapsed_ms']:8.1f} ms  {entry['call']}")
+        return "\n".join(lines)
+
+    def dump(self, file_path):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(self.report(limit=1000))
+            f.write("\n")
+
+    def reset(self):
+        with self.lock:
+            self.statements.clear()
+            self.calls.clear()
+            self.slow_log.clear()
+
+
+def rows_returned(result):
+    """Row count of a service result where it can be told: lists, and (list, token) pages"""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        return len(result[0])
+    return None
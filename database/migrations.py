@@ -0,0 +1,333 @@
+import time
+
+# Schema migrations keyed on PRAGMA user_version.
+# Every step runs once, in order, when the database is older than its version.
+# Steps must be safe to run again: a batched step interrupted half-way is
+# restarted on the next launch because user_version is only bumped at the end.
+
+BATCH_SIZE = 5000
+PROGRESS_INTERVAL_S = 1.0
+PROGRESS_VM_STEPS = 100000
+
+
+def print_progress(message):
+    print(message)
+
+
+def run_in_batches(con, table, statement, description, progress, batch_size=BATCH_SIZE):
+    """Run statement over table in id windows (bound as ? < id <= ?), committing after each batch"""
+    max_id = con.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+    for low in range(0, max_id, batch_size):
+        high = min(low + batch_size, max_id)
+        con.execute(statement, (low, high))
+        con.commit()
+        progress(f"{description}: {high}/{max_id}")
+
+
+def execute_with_progress(con, statement, description, progress):
+    """Execute one long statement, reporting elapsed time every PROGRESS_INTERVAL_S"""
+    started = time.monotonic()
+    last_report = [started]
+
+    def report():
+        now = time.monotonic()
+        if now - last_report[0] >= PROGRESS_INTERVAL_S:
+            last_report[0] = now
+            progress(f"{description}... {now - started:.0f}s")
+        return 0
+
+    con.set_progress_handler(report, PROGRESS_VM_STEPS)
+    try:
+        con.execute(statement)
+    finally:
+        con.set_progress_handler(None, 0)
+
+
+def create_index(con, name, table, columns, progress):
+    """CREATE INDEX with progress output, SQLite builds an index in a single statement"""
+    exists = con.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone()
+    if exists:
+        return
+
+    rows = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    progress(f"Building index {name} over {rows} rows of {table}")
+    execute_with_progress(
+        con, f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})", f"Building index {name}", progress
+    )
+
+
+def create_base_tables(con, progress):
+    table_user = """
+    CREATE TABLE if NOT EXISTS users(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE,
+    password_hash TEXT,
+    is_admin BOOLEAN DEFAULT 0
+    )
+     """
+
+    table_sales = """
+    CREATE TABLE if NOT EXISTS sales(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doc TEXT,
+    amount REAL,
+    timestamp TEXT,
+    user_id INTEGER,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+    )
+     """
+
+    table_offers = """
+    CREATE TABLE if NOT EXISTS offers(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cif TEXT,
+    timestamp TEXT,
+    name TEXT,
+    address TEXT,
+    phone TEXT,
+    user_id INTEGER,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+    )
+     """
+
+    table_offers_positions = """
+    CREATE TABLE if NOT EXISTS offers_positions(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    offer_id INTEGER,
+    product_code TEXT,
+    product_name TEXT,
+    quantity REAL,
+    unit_price REAL,
+    vat REAL,
+    FOREIGN KEY (offer_id) REFERENCES offers(id) ON DELETE CASCADE
+    )
+     """
+
+    for table in (table_user, table_sales, table_offers, table_offers_positions):
+        con.execute(table)
+
+
+def create_lookup_indexes(con, progress):
+    create_index(con, "idx_sales_user_timestamp", "sales", "user_id, timestamp", progress)
+    create_index(con, "idx_offers_positions_offer_id", "offers_positions", "offer_id", progress)
+
+
+def create_sales_daily_rollup(con, progress):
+    table_rollup = """
+    CREATE TABLE if NOT EXISTS sales_daily_rollup(
+    user_id INTEGER,
+    day TEXT,
+    sale_count INTEGER NOT NULL,
+    total_amount REAL NOT NULL,
+    PRIMARY KEY (user_id, day)
+    ) WITHOUT ROWID
+     """
+
+    trigger_insert = """
+    CREATE TRIGGER if NOT EXISTS trg_sales_rollup_insert AFTER INSERT ON sales
+    BEGIN
+        INSERT INTO sales_daily_rollup (user_id, day, sale_count, total_amount)
+        VALUES (NEW.user_id, date(NEW.timestamp), 1, NEW.amount)
+        ON CONFLICT (user_id, day) DO UPDATE SET
+            sale_count = sale_count + 1,
+            total_amount = total_amount + excluded.total_amount;
+    END
+     """
+
+    trigger_delete = """
+    CREATE TRIGGER if NOT EXISTS trg_sales_rollup_delete AFTER DELETE ON sales
+    BEGIN
+        UPDATE sales_daily_rollup
+        SET sale_count = sale_count - 1, total_amount = total_amount - OLD.amount
+        WHERE user_id = OLD.user_id AND day = date(OLD.timestamp);
+        DELETE FROM sales_daily_rollup
+        WHERE user_id = OLD.user_id AND day = date(OLD.timestamp) AND sale_count <= 0;
+    END
+     """
+
+    trigger_update = """
+    CREATE TRIGGER if NOT EXISTS trg_sales_rollup_update AFTER UPDATE OF amount, timestamp, user_id ON sales
+    BEGIN
+        UPDATE sales_daily_rollup
+        SET sale_count = sale_count - 1, total_amount = total_amount - OLD.amount
+        WHERE user_id = OLD.user_id AND day = date(OLD.timestamp);
+        DELETE FROM sales_daily_rollup
+        WHERE user_id = OLD.user_id AND day = date(OLD.timestamp) AND sale_count <= 0;
+        INSERT INTO sales_daily_rollup (user_id, day, sale_count, total_amount)
+        VALUES (NEW.user_id, date(NEW.timestamp), 1, NEW.amount)
+        ON CONFLICT (user_id, day) DO UPDATE SET
+            sale_count = sale_count + 1,
+            total_amount = total_amount + excluded.total_amount;
+    END
+     """
+
+    backfill = """
+    INSERT INTO sales_daily_rollup (user_id, day, sale_count, total_amount)
+    SELECT user_id, date(timestamp), COUNT(*), SUM(amount)
+    FROM sales
+    WHERE id > ? AND id <= ?
+    GROUP BY user_id, date(timestamp)
+    ON CONFLICT (user_id, day) DO UPDATE SET
+        sale_count = sale_count + excluded.sale_count,
+        total_amount = total_amount + excluded.total_amount
+     """
+
+    # Rebuilt from scratch so an interrupted backfill can simply run again
+    for trigger in ("trg_sales_rollup_insert", "trg_sales_rollup_delete", "trg_sales_rollup_update"):
+        con.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    con.execute(table_rollup)
+    con.execute("DELETE FROM sales_daily_rollup")
+    con.commit()
+
+    run_in_batches(con, "sales", backfill, "Building sales_daily_rollup", progress)
+
+    for trigger in (trigger_insert, trigger_delete, trigger_update):
+        con.execute(trigger)
+
+
+def create_offers_user_index(con, progress):
+    create_index(con, "idx_offers_user_timestamp", "offers", "user_id, timestamp", progress)
+
+
+def create_search_index(con, progress):
+    # External content tables: the text stays in sales/offers/offers_positions and
+    # the FTS tables only hold the index, kept in sync by the triggers below.
+    # remove_diacritics lets "stefan" find "Ștefan", prefix indexes serve typed prefixes.
+    fts_tables = {
+        "sales_fts": ("sales", "doc"),
+        "offers_fts": ("offers", "cif, name, address, phone"),
+        "offers_positions_fts": ("offers_positions", "product_code, product_name"),
+    }
+
+    for fts, (table, columns) in fts_tables.items():
+        for trigger in ("insert", "delete", "update"):
+            con.execute(f"DROP TRIGGER IF EXISTS trg_{fts}_{trigger}")
+        con.execute(f"DROP TABLE IF EXISTS {fts}")
+        con.execute(f"""
+        CREATE VIRTUAL TABLE {fts} USING fts5(
+        {columns},
+        content='{table}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+         """)
+
+        column_list = [c.strip() for c in columns.split(",")]
+        new_values = ", ".join(f"NEW.{c}" for c in column_list)
+        old_values = ", ".join(f"OLD.{c}" for c in column_list)
+
+        con.execute(f"""
+        CREATE TRIGGER trg_{fts}_insert AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {fts} (rowid, {columns}) VALUES (NEW.id, {new_values});
+        END
+         """)
+        con.execute(f"""
+        CREATE TRIGGER trg_{fts}_delete AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+        END
+         """)
+        con.execute(f"""
+        CREATE TRIGGER trg_{fts}_update AFTER UPDATE OF {columns} ON {table}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+            INSERT INTO {fts} (rowid, {columns}) VALUES (NEW.id, {new_values});
+        END
+         """)
+
+        # 'rebuild' indexes every row of the content table in a single statement
+        rows = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        progress(f"Building search index {fts} over {rows} rows of {table}")
+        execute_with_progress(
+            con, f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')", f"Building search index {fts}", progress
+        )
+
+
+def add_rollup_min_max(con, progress):
+    # Per-day smallest and largest sale, so range figures are one rollup query too.
+    # A delete can only be folded out of min/max by looking at the day's remaining
+    # sales, so the triggers recompute them for that one day, and only when the
+    # removed amount was the day's minimum or maximum.
+    columns = {row[1] for row in con.execute("PRAGMA table_info(sales_daily_rollup)")}
+    for column in ("min_amount", "max_amount"):
+        if column not in columns:
+            con.execute(f"ALTER TABLE sales_daily_rollup ADD COLUMN {column} REAL")
+
+    upsert_new = """
+        INSERT INTO sales_daily_rollup (user_id, day, sale_count, total_amount, min_amount, max_amount)
+        VALUES (NEW.user_id, date(NEW.timestamp), 1, NEW.amount, NEW.amount, NEW.amount)
+        ON CONFLICT (user_id, day) DO UPDATE SET
+            sale_count = sale_count + 1,
+            total_amount = total_amount + excluded.total_amount,
+            min_amount = min(COALESCE(min_amount, excluded.min_amount), excluded.min_amount),
+            max_amount = max(COALESCE(max_amount, excluded.max_amount), excluded.max_amount);
+    """
+    remove_old = """
+        UPDATE sales_daily_rollup
+        SET sale_count = sale_count - 1, total_amount = total_amount - OLD.amount
+        WHERE user_id = OLD.user_id AND day = date(OLD.timestamp);
+        UPDATE sales_daily_rollup SET
+            min_amount = (SELECT MIN(amount) FROM sales
+                          WHERE user_id = OLD.user_id AND timestamp >= date(OLD.timestamp)
+                          AND timestamp < date(OLD.timestamp, '+1 day')),
+            max_amount = (SELECT MAX(amount) FROM sales
+                          WHERE user_id = OLD.user_id AND timestamp >= date(OLD.timestamp)
+                          AND timestamp < date(OLD.timestamp, '+1 day'))
+        WHERE user_id = OLD.user_id AND day = date(OLD.timestamp)
+        AND (OLD.amount <= min_amount OR OLD.amount >= max_amount);
+        DELETE FROM sales_daily_rollup
+        WHERE user_id = OLD.user_id AND day = date(OLD.timestamp) AND sale_count <= 0;
+    """
+    triggers = {
+        "trg_sales_rollup_insert": f"AFTER INSERT ON sales BEGIN {upsert_new} END",
+        "trg_sales_rollup_delete": f"AFTER DELETE ON sales BEGIN {remove_old} END",
+        "trg_sales_rollup_update":
+            f"AFTER UPDATE OF amount, timestamp, user_id ON sales BEGIN {remove_old} {upsert_new} END",
+    }
+    for name, body in triggers.items():
+        con.execute(f"DROP TRIGGER IF EXISTS {name}")
+        con.execute(f"CREATE TRIGGER {name} {body}")
+
+    rows = con.execute("SELECT COUNT(*) FROM sales_daily_rollup").fetchone()[0]
+    progress(f"Filling min/max of {rows} sales_daily_rollup days")
+    backfill = """
+    UPDATE sales_daily_rollup SET
+        min_amount = (SELECT MIN(amount) FROM sales s
+                      WHERE s.user_id = sales_daily_rollup.user_id AND s.timestamp >= sales_daily_rollup.day
+                      AND s.timestamp < date(sales_daily_rollup.day, '+1 day')),
+        max_amount = (SELECT MAX(amount) FROM sales s
+                      WHERE s.user_id = sales_daily_rollup.user_id AND s.timestamp >= sales_daily_rollup.day
+                      AND s.timestamp < date(sales_daily_rollup.day, '+1 day'))
+     """
+    execute_with_progress(con, backfill, "Filling sales_daily_rollup min/max", progress)
+
+
+MIGRATIONS = [
+    (1, "users, sales, offers and offers_positions tables", create_base_tables),
+    (2, "sales(user_id, timestamp) and offers_positions(offer_id) indexes", create_lookup_indexes),
+    (3, "sales_daily_rollup table maintained by triggers on sales", create_sales_daily_rollup),
+    (4, "offers(user_id, timestamp) index for keyset pagination", create_offers_user_index),
+    (5, "FTS5 search index over sales, offers and offer positions", create_search_index),
+    (6, "per-day min and max amounts in sales_daily_rollup", add_rollup_min_max),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def migrate(con, progress=print_progress):
+    """Bring the schema up to LATEST_VERSION, a single pragma read when it is already current"""
+    current = con.execute("PRAGMA user_version").fetchone()[0]
+    if current >= LATEST_VERSION:
+        return current
+
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        progress(f"Migrating database to v{version}: {description}")
+        step(con, progress)
+        con.execute(f"PRAGMA user_version = {version}")
+        con.commit()
+        current = version
+
+    progress(f"Database schema at v{current}")
+    return current
@@ -1,7 +1,11 @@
+import os
+import multiprocessing
 from database.connection import Database
+from database.instrumentation import SLOW_QUERY_MS
 from services.auth_service import AuthService
 from services.sales_service import SalesService
 from services.offer_service import OfferService
+from services.cached_offer_service import CachedOfferService
 from ui.login_window import LoginWindow
 
 
@@ -25,13 +29,35 @@ from ui.login_window import LoginWindow
 
 
 if __name__ == "__main__":
+    # Batch PDF exports run in worker processes, which the frozen build has to start itself
+    multiprocessing.freeze_support()
     db = Database()
     auth_service = AuthService(db)
     sales_service = SalesService(db)
     offer_service = OfferService(db)
+
+    # SALESAPP_SLOW_QUERY_MS=<ms> turns on SQL statistics and the slow-query log
+    slow_query_ms = os.environ.get("SALESAPP_SLOW_QUERY_MS")
+    if slow_query_ms:
+        try:
+            slow_query_ms = float(slow_query_ms)
+        except ValueError:
+            print(f"SALESAPP_SLOW_QUERY_MS={slow_query_ms!r} is not a number, using {SLOW_QUERY_MS} ms")
+            slow_query_ms = SLOW_QUERY_MS
+        stats = db.enable_instrumentation(slow_query_ms)
+        for service in (auth_service, sales_service, offer_service):
+            stats.instrument(service)
+
+    # Instrumented first, so the statistics only count offer reads that reach SQLite
+    offer_service = CachedOfferService(offer_service)
+
     app = LoginWindow(
         auth_service=auth_service,
         sales_service=sales_service,
         offer_service=offer_service
     )
     app.mainloop()
+    if db.stats is not None:
+        print(db.stats.report())
+        print(f"Offer cache: {offer_service.cache.stats()}")
+    db.close()
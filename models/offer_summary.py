@@ -0,0 +1,8 @@
+
+class OfferSummary:
+    def __init__(self,id,client,timestamp,position_count,total):
+        self.id = id
+        self.client = client
+        self.timestamp = timestamp
+        self.position_count = position_count
+        self.total = total
@@ -21,8 +21,8 @@ class AuthService:
 
             values = (username, password_hash, is_admin)
 
-            self.db.con.execute(insert_new_user,values )
-            self.db.con.commit()
+            with self.db.connection() as con:
+                con.execute(insert_new_user,values )
             print("User Added")
             return True
         except sqlite3.IntegrityError:
@@ -34,12 +34,11 @@ class AuthService:
 
     def login_user(self, username):
         try:
-            cursor = self.db.con.cursor()
             new_query = """ 
             SELECT * FROM users WHERE username=? ;
             """ 
-            cursor.execute(new_query,(username,))
-            user_data = cursor.fetchone()
+            with self.db.connection() as con:
+                user_data = con.execute(new_query,(username,)).fetchone()
 
             if user_data == None:
                 return None
@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ServiceProxy:
+    """Wraps a service so every method call is submitted to an executor and returns a Future"""
+
+    def __init__(self, service, executor):
+        self.service = service
+        self.executor = executor
+
+    def __getattr__(self, name):
+        method = getattr(self.service, name)
+
+        def submit(*args, **kwargs):
+            return self.executor.submit(method, *args, **kwargs)
+
+        return submit
+
+
+class BackgroundService:
+    """Runs SalesService and OfferService calls on a dedicated worker thread.
+
+    A single worker keeps calls in submission order, so a refresh queued after a save
+    always sees the saved row. Each worker thread gets its own connection from Database.
+    """
+
+    def __init__(self, sales_service, offer_service, max_workers=1):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self.sales = ServiceProxy(sales_service, self.executor)
+        self.offers = ServiceProxy(offer_service, self.executor)
+
+    def submit(self, fn, *args, **kwargs):
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
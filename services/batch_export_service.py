@@ -0,0 +1,148 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from services.export_service import ExportCancelled
+from services.offer_document_service import OfferDocumentService, offer_totals
+from services.report_service import render_day_report
+
+MANIFEST_FILE = "manifest.json"
+# Renders queued in the pool per worker; tasks are only loaded as slots free up, so
+# at most this many per worker are held in memory at once
+TASKS_IN_FLIGHT_PER_WORKER = 2
+
+# Renderer of the current worker process, set up by init_worker
+worker_documents = None
+
+
+def init_worker():
+    global worker_documents
+    worker_documents = OfferDocumentService()
+
+
+def timed_render(render, file_path, *args):
+    """Run render(file_path, *args, on_page) in a worker, returns the manifest fields"""
+    started = time.perf_counter()
+    pages = []
+    render(file_path, *args, lambda canvas, doc: pages.append(doc.page))
+    return {
+        'pages': len(pages),
+        'bytes': os.path.getsize(file_path),
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def render_offer_file(file_path, offer, on_page):
+    worker_documents.render(offer, offer_totals(offer), file_path, on_page)
+
+
+def render_day_file(file_path, username, day, sales, sales_count, total_amount, on_page):
+    render_day_report(file_path, username, day, sales, sales_count, total_amount, on_page)
+
+
+class BatchExportService:
+    """Renders many offer or daily sales PDFs at once, spread over a process pool.
+
+    The export thread loads the data of each file from the services just before
+    handing it to the pool, as plain model objects, workers never touch the database.
+    Only a few files per worker are queued at a time, so memory stays bounded by the
+    window rather than the size of the export. A failing load fails the job. Every
+    run leaves a manifest.json next to the PDFs listing each file with its status,
+    page count, size and render time.
+    """
+
+    def __init__(self, sales_service, offer_service, max_workers=None):
+        self.sales_service = sales_service
+        self.offer_service = offer_service
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def export_offers(self, job, directory, offer_ids):
+        def tasks():
+            for offer_id in offer_ids:
+                offer = self.offer_service.get_offer_by_id(offer_id)
+                if offer is not None:
+                    yield f"Offer {offer.id}", f"offer_{offer.id}.pdf", render_offer_file, (offer,)
+
+        return self.run(job, directory, "offers", len(offer_ids), tasks())
+
+    def export_days(self, job, directory, user, start, end):
+        job.report("Loading days")
+        days = self.sales_service.fetch_daily_totals_between(user, start, end)
+
+        def tasks():
+            for day, day_count, day_total in days:
+                day_sales = list(self.sales_service.iter_sales_between(user, day, day + timedelta(days=1)))
+                yield (
+                    f"Daily report {day.isoformat()}",
+                    f"daily_sales_{day.isoformat()}.pdf",
+                    render_day_file,
+                    (user.username, day, day_sales, day_count, day_total)
+                )
+
+        return self.run(job, directory, "days", len(days), tasks())
+
+    def run(self, job, directory, kind, count, tasks):
+        """Render (title, file name, render function, args) tasks into directory, returns the
+        manifest. tasks is consumed lazily, count is the number it is expected to yield."""
+        os.makedirs(directory, exist_ok=True)
+        started = time.perf_counter()
+        items = []
+        workers = min(self.max_workers, count) or 1
+        job.report(f"0/{count} PDFs rendered", 0, count)
+
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+        try:
+            pending = {}
+            tasks = iter(tasks)
+            done = 0
+            while True:
+                # top the window up, loading the next files only now
+                for title, file_name, render, args in tasks:
+                    item = {'title': title, 'file': file_name, 'status': 'queued'}
+                    items.append(item)
+                    future = executor.submit(timed_render, render, os.path.join(directory, file_name), *args)
+                    pending[future] = item
+                    if len(pending) >= workers * TASKS_IN_FLIGHT_PER_WORKER:
+                        break
+                if not pending:
+                    break
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    item = pending.pop(future)
+                    try:
+                        item.update(future.result(), status='done')
+                    except Exception as e:
+                        print(f"Error {e}")
+                        item.update(status='failed', error=str(e))
+                    done += 1
+                job.report(f"{done}/{count} PDFs rendered", done)
+        except Exception:
+            for item in items:
+                if item['status'] == 'queued':
+                    item['status'] = 'cancelled'
+            raise
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            manifest = self.write_manifest(directory, kind, items, workers, time.perf_counter() - started)
+
+        if manifest['failed']:
+            raise RuntimeError(f"{manifest['failed']} of {len(items)} PDFs failed, see {MANIFEST_FILE}")
+        return manifest
+
+    def write_manifest(self, directory, kind, items, workers, seconds):
+        manifest = {
+            'kind': kind,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'workers': workers,
+            'seconds': round(seconds, 3),
+            'count': len(items),
+            'done': sum(1 for item in items if item['status'] == 'done'),
+            'failed': sum(1 for item in items if item['status'] == 'failed'),
+            'pages': sum(item.get('pages', 0) for item in items),
+            'items': items,
+        }
+        with open(os.path.join(directory, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
@@ -0,0 +1,239 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from services.offer_document_service import TEMPLATE_VERSION
+
+PDF_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Recently rendered documents kept in memory, so preview then save is served without disk reads
+RECENT_DOCUMENTS_MAX_BYTES = 8 * 1024 * 1024
+
+# Preview copies are left for the PDF viewer in the temp dir and removed once older than this
+PREVIEW_PREFIX = "offer_preview_"
+PREVIEW_MAX_AGE_S = 24 * 60 * 60
+
+# Unfinished renders left behind by a crash are removed once older than this
+PARTIAL_MAX_AGE_S = 60 * 60
+
+
+def document_key(offer, totals, issue_date):
+    """Hash of everything that ends up in the rendered offer document"""
+    content = [
+        TEMPLATE_VERSION,
+        issue_date,
+        [offer.id, offer.cif, offer.name, offer.address, offer.phone],
+        [
+            [p.product_code, p.product_name, p.quantity, p.unit_price, p.vat]
+            for p in offer.products or []
+        ],
+        [totals['subtotal'], totals['vat_total'], totals['final_total']],
+    ]
+    return hashlib.sha256(json.dumps(content).encode('utf-8')).hexdigest()
+
+
+def remove_stale_files(directory, prefix, suffix, max_age_s):
+    now = time.time()
+    try:
+        entries = list(os.scandir(directory))
+    except OSError as e:
+        print(f"Error {e}")
+        return 0
+    removed = 0
+    for entry in entries:
+        if not (entry.name.startswith(prefix) and entry.name.endswith(suffix)):
+            continue
+        try:
+            if now - entry.stat().st_mtime > max_age_s:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            pass  # still open in a viewer, next cleanup gets it
+    return removed
+
+
+class PdfCache:
+    """Directory of rendered PDFs named by their content key, bounded by total size.
+
+    A hit touches the file's mtime, so eviction drops the least recently used files
+    first. Documents arrive as finished bytes and are written in one go under a
+    temporary name, then renamed, a reader never sees half a PDF.
+    """
+
+    def __init__(self, directory, max_bytes=PDF_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        remove_stale_files(directory, "", ".partial", PARTIAL_MAX_AGE_S)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def read(self, key):
+        """Cached document bytes for key, None on a miss"""
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None  # evicted in between
+
+    def put(self, key, data):
+        """Store the document bytes under key, returns its cached path"""
+        fd, partial_path = tempfile.mkstemp(suffix=".partial", dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(partial_path, self.path(key))
+        except BaseException:
+            try:
+                os.remove(partial_path)
+            except OSError:
+                pass
+            raise
+        self.evict(keep=self.path(key))
+        return self.path(key)
+
+    def evict(self, keep=None):
+        with self.lock:
+            files = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".pdf") and entry.path != keep:
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in files)
+            if keep is not None and os.path.exists(keep):
+                total += os.path.getsize(keep)
+
+            for mtime, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'max_bytes': self.max_bytes,
+        }
+
+
+class CachedOfferDocumentService:
+    """PdfCache in front of an OfferDocumentService.
+
+    Documents are rendered into memory and keyed by document_key. The most recent ones
+    stay in memory up to RECENT_DOCUMENTS_MAX_BYTES, older ones are read back from the
+    PdfCache, so previewing and then saving an offer renders it once. A render for a
+    save is also stored in the PdfCache; one for a preview only goes to the preview
+    file, so every render is written to disk once. Preview files older than
+    PREVIEW_MAX_AGE_S are cleaned out of the temp dir when the service starts.
+    """
+
+    def __init__(self, document_service, cache_dir, max_bytes=PDF_CACHE_MAX_BYTES,
+                 recent_max_bytes=RECENT_DOCUMENTS_MAX_BYTES):
+        self.service = document_service
+        self.cache = PdfCache(cache_dir, max_bytes)
+        self.recent = OrderedDict()
+        self.recent_bytes = 0
+        self.recent_max_bytes = recent_max_bytes
+        self.recent_lock = threading.Lock()
+        remove_stale_files(tempfile.gettempdir(), PREVIEW_PREFIX, ".pdf", PREVIEW_MAX_AGE_S)
+
+    def __getattr__(self, name):
+        return getattr(self.service, name)
+
+    def document(self, offer, totals, on_page=None, store=True, issue_date=None):
+        """(key, PDF bytes) of the offer document, rendered into memory on a miss and
+        written to the PdfCache as well when store is set. issue_date defaults to today."""
+        issue_date = issue_date or datetime.now().strftime('%d/%m/%Y')
+        key = document_key(offer, totals, issue_date)
+        data = self.recent_get(key)
+        if data is None:
+            data = self.cache.read(key)
+            if data is None:
+                buffer = io.BytesIO()
+                self.service.render(offer, totals, buffer, on_page, issue_date)
+                data = buffer.getvalue()
+                if store:
+                    self.cache.put(key, data)
+            self.recent_put(key, data)
+        return key, data
+
+    def recent_get(self, key):
+        with self.recent_lock:
+            data = self.recent.get(key)
+            if data is not None:
+                self.recent.move_to_end(key)
+            return data
+
+    def recent_put(self, key, data):
+        with self.recent_lock:
+            if key in self.recent:
+                return
+            self.recent[key] = data
+            self.recent_bytes += len(data)
+            while self.recent_bytes > self.recent_max_bytes and len(self.recent) > 1:
+                _, dropped = self.recent.popitem(last=False)
+                self.recent_bytes -= len(dropped)
+
+    def render(self, offer, totals, target, on_page=None):
+        _, data = self.document(offer, totals, on_page)
+        if isinstance(target, str):
+            with open(target, 'wb') as f:
+                f.write(data)
+        else:
+            target.write(data)
+
+    def preview_path(self, offer, totals):
+        """File of the document for a PDF viewer to open. Viewers are started with a
+        path, so the document is written out once; a repeated preview of one version
+        finds the file by its key and returns it without rendering."""
+        issue_date = datetime.now().strftime('%d/%m/%Y')
+        key = document_key(offer, totals, issue_date)
+        path = os.path.join(tempfile.gettempdir(), f"{PREVIEW_PREFIX}{offer.id}_{key[:12]}.pdf")
+        if os.path.exists(path):
+            return path
+
+        _, data = self.document(offer, totals, store=False, issue_date=issue_date)
+        # named like a preview so remove_stale_files also clears one left by a crash
+        fd, partial_path = tempfile.mkstemp(suffix=".partial.pdf", prefix=PREVIEW_PREFIX)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(partial_path, path)
+        except BaseException:
+            try:
+                os.remove(partial_path)
+            except OSError:
+                pass
+            raise
+        return path
@@ -0,0 +1,263 @@
+import sys
+import threading
+from collections import OrderedDict
+from models.offer import Offer
+from models.offer_pos import Offer_pos
+from database.fts import SEARCH_LIMIT
+from services.offer_service import PAGE_SIZE
+
+OFFER_CACHE_MAX_BYTES = 8 * 1024 * 1024
+# Summary pages and search results kept per user, least recently used dropped first
+SUMMARY_PAGES_PER_USER = 32
+
+
+def estimate_size(offer):
+    """Rough in-memory footprint of an Offer and its positions, in bytes"""
+    size = 0
+    for obj in (offer, *offer.products):
+        size += sys.getsizeof(obj) + sys.getsizeof(obj.__dict__)
+        size += sum(sys.getsizeof(value) for value in obj.__dict__.values())
+    return size
+
+
+def with_products(offer, products):
+    """Copy of offer with another positions list, cached offers are never mutated once handed out"""
+    return Offer(
+        id=offer.id,
+        cif=offer.cif,
+        name=offer.name,
+        address=offer.address,
+        phone=offer.phone,
+        timestamp=offer.timestamp,
+        user_id=offer.user_id,
+        products=products
+    )
+
+
+class OfferCache:
+    """LRU of Offer objects keyed by offer id, bounded by their estimated size in bytes,
+    plus the per-user index of cached offer list views.
+
+    user_pages maps a user id to an LRU of that user's summary pages and search results,
+    keyed by the arguments they were read with. Any write to one of the user's offers
+    drops them all, a summary holds totals over every position of its offers.
+    position_index maps position ids to offer ids so position writes can find the
+    entry to update.
+    """
+
+    def __init__(self, max_bytes=OFFER_CACHE_MAX_BYTES, pages_per_user=SUMMARY_PAGES_PER_USER):
+        self.max_bytes = max_bytes
+        self.pages_per_user = pages_per_user
+        self.lock = threading.RLock()
+        self.entries = OrderedDict()
+        self.user_pages = {}
+        self.position_index = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, offer_id):
+        with self.lock:
+            entry = self.entries.get(offer_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(offer_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, offer):
+        with self.lock:
+            self.store(offer)
+            self.evict()
+
+    def get_page(self, user_id, key):
+        with self.lock:
+            pages = self.user_pages.get(user_id)
+            if pages is None or key not in pages:
+                self.misses += 1
+                return None
+            pages.move_to_end(key)
+            self.hits += 1
+            return pages[key]
+
+    def put_page(self, user_id, key, page):
+        with self.lock:
+            pages = self.user_pages.setdefault(user_id, OrderedDict())
+            pages[key] = page
+            pages.move_to_end(key)
+            while len(pages) > self.pages_per_user:
+                pages.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_pages(self, user_id=None, offer_id=None):
+        """Drop the list views of user_id, or of offer_id's owner; of every user when
+        the owner is not known"""
+        with self.lock:
+            if user_id is None and offer_id is not None:
+                entry = self.entries.get(offer_id)
+                if entry is not None:
+                    user_id = entry[0].user_id
+            if user_id is None:
+                self.user_pages.clear()
+            else:
+                self.user_pages.pop(user_id, None)
+
+    def update_products(self, offer_id, update):
+        """Replace a cached offer by a copy whose positions are update(positions)"""
+        with self.lock:
+            entry = self.entries.get(offer_id)
+            if entry is not None:
+                self.store(with_products(entry[0], update(list(entry[0].products))))
+                self.evict()
+
+    def offer_id_of_position(self, position_id):
+        with self.lock:
+            return self.position_index.get(position_id)
+
+    def remove(self, offer_id):
+        with self.lock:
+            entry = self.entries.pop(offer_id, None)
+            if entry is None:
+                return
+            offer, size = entry
+            self.bytes -= size
+            for product in offer.products:
+                self.position_index.pop(product.id, None)
+
+    def store(self, offer):
+        previous = self.entries.pop(offer.id, None)
+        if previous is not None:
+            self.bytes -= previous[1]
+            for product in previous[0].products:
+                self.position_index.pop(product.id, None)
+        size = estimate_size(offer)
+        self.entries[offer.id] = (offer, size)
+        self.bytes += size
+        for product in offer.products:
+            self.position_index[product.id] = offer.id
+
+    def evict(self):
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            offer_id, (offer, size) = self.entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+            for product in offer.products:
+                self.position_index.pop(product.id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.user_pages.clear()
+            self.position_index.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'pages': sum(len(pages) for pages in self.user_pages.values()),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+class CachedOfferService:
+    """Write-through OfferCache in front of an OfferService.
+
+    Single offers, the saved offers list pages and offer searches are served from the
+    cache when possible. Writes go to the database first, then update the cached offer
+    in place (as a new copy) and drop the owner's cached list views. Failed reads are
+    never cached. Methods not overridden here go straight to the wrapped service.
+    """
+
+    def __init__(self, offer_service, max_bytes=OFFER_CACHE_MAX_BYTES):
+        self.service = offer_service
+        self.cache = OfferCache(max_bytes)
+
+    def __getattr__(self, name):
+        return getattr(self.service, name)
+
+    def get_offer_by_id(self, offer_id):
+        offer = self.cache.get(offer_id)
+        if offer is None:
+            offer = self.service.get_offer_by_id(offer_id)
+            if offer is not None:
+                self.cache.put(offer)
+        return offer
+
+    def get_offer_summaries_page(self, user, after=None, limit=PAGE_SIZE):
+        key = ('page', tuple(after) if after else None, limit)
+        page = self.cache.get_page(user.id, key)
+        if page is None:
+            try:
+                page = self.service.fetch_offer_summaries_page(user, after, limit)
+            except Exception as e:
+                print(f"Error {e}")
+                return [], None
+            self.cache.put_page(user.id, key, page)
+        return page
+
+    def search_offer_summaries(self, user, text, limit=SEARCH_LIMIT):
+        key = ('search', text, limit)
+        summaries = self.cache.get_page(user.id, key)
+        if summaries is None:
+            try:
+                summaries = self.service.fetch_search_offer_summaries(user, text, limit)
+            except Exception as e:
+                print(f"Error {e}")
+                return []
+            self.cache.put_page(user.id, key, summaries)
+        return summaries
+
+    def create_offer(self, cif, name, address, phone, products, user):
+        offer_id = self.service.create_offer(cif, name, address, phone, products, user)
+        if offer_id:
+            self.cache.invalidate_pages(user_id=user.id)
+        return offer_id
+
+    def delete_offer(self, offer_id):
+        deleted = self.service.delete_offer(offer_id)
+        if deleted:
+            self.cache.invalidate_pages(offer_id=offer_id)
+            self.cache.remove(offer_id)
+        return deleted
+
+    def add_product(self, id, code, name, quantity, price, vat):
+        position_id = self.service.add_product(id, code, name, quantity, price, vat)
+        if position_id:
+            self.cache.invalidate_pages(offer_id=id)
+            position = Offer_pos(position_id, id, code, name, quantity, price, vat)
+            self.cache.update_products(id, lambda products: products + [position])
+        return position_id
+
+    def update_product(self, id_prod, code, name, quantity, price, vat):
+        updated = self.service.update_product(id_prod, code, name, quantity, price, vat)
+        offer_id = self.cache.offer_id_of_position(id_prod)
+        if updated:
+            self.cache.invalidate_pages(offer_id=offer_id)
+        if updated and offer_id is not None:
+            position = Offer_pos(id_prod, offer_id, code, name, quantity, price, vat)
+            self.cache.update_products(
+                offer_id,
+                lambda products: [position if p.id == id_prod else p for p in products]
+            )
+        return updated
+
+    def delete_product(self, product_id):
+        deleted = self.service.delete_product(product_id)
+        offer_id = self.cache.offer_id_of_position(product_id)
+        if deleted:
+            self.cache.invalidate_pages(offer_id=offer_id)
+        if deleted and offer_id is not None:
+            self.cache.update_products(
+                offer_id,
+                lambda products: [p for p in products if p.id != product_id]
+            )
+        return deleted
@@ -0,0 +1,103 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class ExportJob:
+    """One queued export. The worker writes the progress fields, the UI thread only reads them."""
+
+    def __init__(self, title, file_path, build):
+        self.title = title
+        self.file_path = file_path
+        self.build = build
+        self.status = 'queued'   # queued, running, done, failed or cancelled
+        self.message = "Queued"
+        self.done = 0
+        self.total = 0
+        self.pages = 0
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    def report(self, message, done=None, total=None):
+        self.check_cancelled()
+        self.message = message
+        if done is not None:
+            self.done = done
+        if total is not None:
+            self.total = total
+
+    def on_page(self, canvas, doc):
+        """onFirstPage/onLaterPages callback for doc.build, called as each page starts"""
+        self.pages += 1
+        self.report(f"Rendering page {self.pages}")
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise ExportCancelled()
+
+    def cancel(self):
+        self.cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self.status = 'cancelled'
+            self.message = "Cancelled"
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed', 'cancelled')
+
+
+class ExportService:
+    """Queue of PDF exports built one after another on a worker thread.
+
+    build(job) is called on the worker with the job to report progress through, it must
+    not touch Tk. ReportLab only writes the file once the document is complete, so a
+    cancelled export leaves nothing on disk.
+    """
+
+    def __init__(self, max_workers=1):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export-worker")
+        self.jobs = []
+
+    def submit(self, title, file_path, build):
+        job = ExportJob(title, file_path, build)
+        self.jobs.append(job)
+        job.future = self.executor.submit(self.run, job)
+        return job
+
+    def run(self, job):
+        if job.cancel_event.is_set():
+            job.status = 'cancelled'
+            job.message = "Cancelled"
+            return job
+
+        job.status = 'running'
+        job.message = "Starting"
+        try:
+            job.build(job)
+            job.status = 'done'
+            job.message = f"Saved to {job.file_path}"
+        except ExportCancelled:
+            job.status = 'cancelled'
+            job.message = "Cancelled"
+        except Exception as e:
+            print(f"Error {e}")
+            job.status = 'failed'
+            job.error = e
+            job.message = f"Failed: {e}"
+        return job
+
+    def active_jobs(self):
+        return [job for job in self.jobs if not job.finished]
+
+    def forget(self, job):
+        if job in self.jobs:
+            self.jobs.remove(job)
+
+    def shutdown(self):
+        for job in self.jobs:
+            job.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
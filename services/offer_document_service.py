@@ -0,0 +1,232 @@
+import os
+import threading
+from datetime import datetime
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from utils.resource_path import resource_path
+
+COMPANY_DATA = {
+    'name': 'SC AUTO & AGRO MAGMANN SRL',
+    'registration_number': 'Nr.ord.reg.com.: 02/52/21/2014',
+    'cif': 'RO-33249865',
+    'address': 'ARAD Str. CALE A RADNEI Nr.237 Judet ARAD',
+    'account': 'RO36BTRLRONCRT0257372202',
+    'bank': 'TRANSILVANIA RON / BRD',
+    'phone': '0720961818-ARAD; 0790687201-INEU',
+    'capital': '200'
+}
+
+# Bump when the layout changes, cached PDFs are keyed on it
+TEMPLATE_VERSION = 1
+
+PRODUCT_COL_WIDTHS = [1.2*cm, 6*cm, 1.2*cm, 2*cm, 3*cm, 3*cm, 1.5*cm, 2.5*cm]
+
+
+def offer_totals(offer):
+    """Same figures as OfferDetailWindow.calculate_total_price, for rendering without a window"""
+    total = 0.0
+    vat_total = 0.0
+    for prod in offer.products or []:
+        prod_total = prod.quantity * prod.unit_price
+        total += prod_total
+        vat_total += prod_total * (prod.vat / 100)
+    return {
+        'subtotal': round(total, 2),
+        'vat_total': round(vat_total, 2),
+        'final_total': round(total + vat_total, 2)
+    }
+
+
+class OfferTemplate:
+    """Parts of the offer document that are the same for every offer: styles, the
+    company header, the logo, the products header row and the table styles"""
+
+    def __init__(self, company_data):
+        styles = getSampleStyleSheet()
+        self.normal = styles["Normal"]
+        normal = self.normal
+
+        # === HEADER STÂNGA (companie) ===
+        self.company_lines = [
+            [Paragraph("<b>SC AUTO & AGRO MAGMANN SRL</b>", normal)],
+            [Paragraph(f"Nr.ord.reg.com.: {company_data['registration_number']}", normal)],
+            [Paragraph(f"C.I.F.: {company_data['cif']}", normal)],
+            [Paragraph(f"Sediul: {company_data['address']}", normal)],
+            [Spacer(1, 3)],
+            [Paragraph(f"Contul: {company_data['account']}", normal)],
+            [Paragraph(f"Banca: {company_data['bank']}", normal)],
+            [Paragraph("Contul: RO70INGB0000999908841201", normal)],
+            [Paragraph("Banca: ING BANK ARAD", normal)],
+            [Spacer(1, 3)],
+            [Paragraph("<b>Capital social (RON):</b> " + str(company_data['capital']), normal)],
+            [Paragraph("<b>Telefon:</b> " + company_data['phone'], normal)]
+        ]
+
+        # === HEADER DREAPTA (logo) ===
+        logo_path = resource_path(os.path.join("utils", "logo.png"))
+        if os.path.exists(logo_path):
+            self.logo = Image(logo_path, width=7*cm, height=3.2*cm)
+        else:
+            print(f"Logo not found at: {logo_path}")
+            self.logo = Paragraph("<b>[LOGO]</b>", ParagraphStyle('LogoPlaceholder', fontSize=14, alignment=TA_CENTER))
+        self.title_lines = [
+            [Paragraph("<b>OFERTA DE PRET</b>", normal)],
+            [Paragraph("Seria MAG", normal)],
+        ]
+
+        self.company_table_style = TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ])
+
+        # === CLIENT ===
+        self.client_title = Paragraph("<i>Cumparator - Client</i>", ParagraphStyle(
+            'ClientTitle', fontSize=9, textColor=colors.grey, alignment=TA_LEFT
+        ))
+        self.client_table_style = TableStyle([
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BOX', (0, 0), (-1, -1), 1, colors.black),
+            ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ])
+
+        # === PRODUSE ===
+        header_style = ParagraphStyle(
+            'HeaderStyle',
+            fontSize=7,
+            alignment=TA_CENTER,
+            leading=8,
+            wordWrap='CJK'
+        )
+        self.products_header = [
+            Paragraph('Nr crt.', header_style),
+            Paragraph('Denumirea produselor sau a serviciilor', header_style),
+            Paragraph('U.M.', header_style),
+            Paragraph('Cantitate', header_style),
+            Paragraph('Pret unitar fara TVA RON', header_style),
+            Paragraph('Valoare fara TVA RON', header_style),
+            Paragraph('Cota TVA %', header_style),
+            Paragraph('Valoare T.V.A. RON', header_style)
+        ]
+        self.products_table_style = TableStyle([
+            # Header
+            ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.8, 1, 0.8, alpha=0.5)),  # verde pastel
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
+
+            # Linii
+            ('ALIGN', (0, 1), (0, -1), 'CENTER'),
+            ('ALIGN', (2, 1), (7, -1), 'CENTER'),
+            ('ALIGN', (1, 1), (1, -3), 'LEFT'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+
+            # Totals
+            ('FONTNAME', (0, -2), (-1, -1), 'Helvetica-Bold'),
+            ('BACKGROUND', (0, -2), (-1, -2), colors.whitesmoke),
+            ('BACKGROUND', (0, -1), (-1, -1), colors.whitesmoke),
+
+            # Borders
+            ('BOX', (0, 0), (-1, -1), 1, colors.black),
+            ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ])
+
+
+class OfferDocumentService:
+    """Renders offer PDFs for both preview and save, so the two always match.
+
+    The OfferTemplate is built on first use and reused for every document after that,
+    only the offer number, client and products tables are built per call. The shared
+    flowables keep layout state while a document is built, so builds are serialized
+    by a lock; an offer is a page or two, so callers barely wait on each other.
+    """
+
+    def __init__(self, company_data=COMPANY_DATA):
+        self.company_data = company_data
+        self.template = None
+        self.lock = threading.Lock()
+
+    def render(self, offer, totals, target, on_page=None, issue_date=None):
+        """Write the offer document to target, a file path or a writable binary file.
+
+        totals is the {'subtotal', 'vat_total', 'final_total'} dict of the offer,
+        on_page is passed to doc.build as the page callback and issue_date is the
+        printed dd/mm/YYYY date, today by default.
+        """
+        if issue_date is None:
+            issue_date = datetime.now().strftime('%d/%m/%Y')
+        with self.lock:
+            if self.template is None:
+                self.template = OfferTemplate(self.company_data)
+            template = self.template
+
+            doc = SimpleDocTemplate(target, pagesize=A4, topMargin=1*cm, bottomMargin=1*cm)
+            story = self.build_story(template, offer, totals, issue_date)
+            if on_page is not None:
+                doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
+            else:
+                doc.build(story)
+
+    def build_story(self, template, offer, totals, issue_date):
+        normal = template.normal
+        story = []
+
+        # === HEADER DREAPTA (logo + info) - folosind ID-ul ofertei ===
+        header_right = [
+            [template.logo],
+            *template.title_lines,
+            [Paragraph(f"Oferta nr. {offer.id}", normal)],
+            [Paragraph(f"Data: {issue_date}", normal)]
+        ]
+        company_table = Table([[template.company_lines, header_right]], colWidths=[10*cm, 7*cm])
+        company_table.setStyle(template.company_table_style)
+        story.append(company_table)
+        story.append(Spacer(1, 12))
+
+        # === CLIENT - folosind datele reale din ofertă ===
+        story.append(template.client_title)
+        client_data = [
+            [f"Nume: {offer.name}", "", "", f"C.I.F. {offer.cif}"],
+            [f"Adresa: {offer.address}", "", "", "Nr.reg.com.:"],
+            [f"Adresa de livrare: IDEM", "", "", f"Telefon: {offer.phone}"],
+        ]
+        client_table = Table(client_data, colWidths=[9*cm, 2*cm, 2*cm, 5*cm])
+        client_table.setStyle(template.client_table_style)
+        story.append(client_table)
+        story.append(Spacer(1, 15))
+
+        # === PRODUSE ===
+        products_rows = [template.products_header]
+        for idx, product in enumerate(offer.products or [], 1):
+            value_without_vat = product.quantity * product.unit_price
+            vat_value = value_without_vat * (product.vat / 100)
+
+            products_rows.append([
+                str(idx),
+                f"{product.product_code} - {product.product_name}",
+                "BUC",
+                f"{product.quantity:.4f}",
+                f"{product.unit_price:.4f}",
+                f"{value_without_vat:.2f}",
+                str(int(product.vat)),
+                f"{vat_value:.2f}"
+            ])
+
+        # Subtotal + TVA
+        products_rows.append([
+            "", "", "", "", "", f"{totals['subtotal']:.2f}", "", f"{totals['vat_total']:.2f}"
+        ])
+
+        # Total RON
+        products_rows.append([
+            "", "", "", "", "TOTAL RON:", "", "", f"{totals['final_total']:.2f}"
+        ])
+
+        products_table = Table(products_rows, colWidths=PRODUCT_COL_WIDTHS)
+        products_table.setStyle(template.products_table_style)
+        story.append(products_table)
+        return story
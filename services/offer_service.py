@@ -4,6 +4,46 @@ import sqlite3
 from models.user import User
 from models.offer import Offer
 from models.offer_pos import Offer_pos
+from models.offer_summary import OfferSummary
+from database.fts import match_expression, SEARCH_LIMIT
+
+PAGE_SIZE = 100
+
+OFFER_WITH_POSITIONS_COLUMNS = """
+    o.id, o.cif, o.timestamp, o.name, o.address, o.phone, o.user_id,
+    p.id, p.offer_id, p.product_code, p.product_name, p.quantity, p.unit_price, p.vat
+"""
+
+
+def group_offer_rows(rows):
+    """Build Offer objects from offer/position join rows, rows of one offer must be adjacent"""
+    final_offers = []
+    offer_obj = None
+    for row in rows:
+        if offer_obj is None or offer_obj.id != row[0]:
+            offer_obj = Offer(
+                id=row[0],
+                cif=row[1],
+                name=row[3],
+                address=row[4],
+                phone=row[5], 
+                timestamp=row[2],
+                user_id=row[6]
+            )
+            final_offers.append(offer_obj)
+
+        if row[7] is not None:
+            offer_obj.products.append(Offer_pos(
+                id=row[7],
+                offer_id=row[8],
+                product_code=row[9],
+                product_name=row[10],
+                quantity=row[11],
+                unit_price=row[12],
+                vat=row[13]
+            ))
+    return final_offers
+
 
 class OfferService:
     def __init__(self,db_instance):
@@ -15,7 +55,6 @@ class OfferService:
                 print("Products list is empty → Offer not created")
                 return False
 
-            cursor = self.db.con.cursor()
             new_timestamp = datetime.now().isoformat()
             new_offer = """ 
             INSERT INTO offers (cif, name, address, phone, timestamp, user_id)
@@ -24,166 +63,176 @@ class OfferService:
 
             values = (cif, name, address, phone, new_timestamp, user.id)
 
-            cursor.execute(new_offer,values)
-            
-            offer_id = cursor.lastrowid
-
-
             new_offer_positions = """ 
             INSERT INTO offers_positions (offer_id, product_code, product_name, quantity, unit_price, vat)
             VALUES (?, ?, ?, ?, ?, ?)
             """
 
-            for product in products:
-                values = (
-                    offer_id,
-                    product.get('product_code'), 
-                    product.get('product_name'), 
-                    product.get('quantity'), 
-                    product.get('unit_price'), 
-                    product.get('vat')
-                )
-                cursor.execute(new_offer_positions,values)
+            with self.db.connection() as con:
+                cursor = con.cursor()
+                cursor.execute(new_offer,values)
+                offer_id = cursor.lastrowid
+
+                for product in products:
+                    values = (
+                        offer_id,
+                        product.get('product_code'), 
+                        product.get('product_name'), 
+                        product.get('quantity'), 
+                        product.get('unit_price'), 
+                        product.get('vat')
+                    )
+                    cursor.execute(new_offer_positions,values)
            
-            self.db.con.commit()
             print("Offer Created")
-            return True
+            return offer_id
             
 
         except sqlite3.IntegrityError:
-            self.db.con.rollback()
             print("Error db")
             return False
         except Exception as e:
-            self.db.con.rollback()
             print(f"Error {e}")
             return False
         
 
-    def get_offers_by_user_by_id(self,id):
+    def load_offers_by_user_id(self, user_id):
+        """Offers of a user with their positions, [] when they could not be loaded"""
         try:
-            get_offers = """ 
-                SELECT * FROM offers WHERE user_id =? ORDER BY timestamp DESC
-            """
-
-            cursor = self.db.con.cursor()
-
-            cursor.execute(get_offers,(id,))
-
-            offers = cursor.fetchall()
-
-            if not offers :
-                print("Error no data")
-                return []
-
-            final_offers = []
-            for offer in offers:
-
-                get_positions_sql = """
-                    SELECT id, offer_id, product_code, product_name, quantity, unit_price, vat 
-                    FROM offers_positions 
-                    WHERE offer_id = ?
-                """
-                cursor.execute(get_positions_sql, (offer[0],))
-                positions_data = cursor.fetchall()
+            return self.fetch_offers_by_user_id(user_id)
+        except Exception as e:
+            print(f"Error {e}")
+            return []
 
+    def fetch_offers_by_user_id(self, user_id):
+        """Offers of a user with their positions, loaded with a single join and grouped in one
+        pass. Unlike load_offers_by_user_id a failed query raises, so callers can tell it from
+        a user without offers."""
+        get_offers = f""" 
+            SELECT {OFFER_WITH_POSITIONS_COLUMNS}
+            FROM offers o
+            LEFT JOIN offers_positions p ON p.offer_id = o.id
+            WHERE o.user_id = ?
+            ORDER BY o.timestamp DESC, o.id DESC, p.id
+        """
+
+        with self.db.connection() as con:
+            rows = con.execute(get_offers,(user_id,)).fetchall()
+
+        if not rows :
+            print("Error no data")
+            return []
 
-                products = []
-                for p in positions_data:
-                    offer_pos = Offer_pos(
-                        id=p[0],
-                        offer_id=p[1],
-                        product_code=p[2],
-                        product_name=p[3],
-                        quantity=p[4],
-                        unit_price=p[5],
-                        vat=p[6]
-                    )
-                    products.append(offer_pos)
-
-                    
-                offer_obj = Offer(
-                    id=offer[0],
-                    cif=offer[1],
-                    name=offer[3],
-                    address=offer[4],
-                    phone=offer[5], 
-                    timestamp=offer[2],
-                    user_id=offer[6],
-                    products = products
-                )
-
-                final_offers.append(offer_obj)
+        print("Fetched Offers")
+        return group_offer_rows(rows)
 
-            
-            print("Fetched Offers")
-            return final_offers
+    def search_offer_summaries(self, user, text, limit=SEARCH_LIMIT):
+        """Matching offer summaries as fetch_search_offer_summaries returns them, [] when the search failed"""
+        try:
+            return self.fetch_search_offer_summaries(user, text, limit)
         except Exception as e:
             print(f"Error {e}")
             return []
 
-    
-    def get_offers_by_user(self, user):
+    def fetch_search_offer_summaries(self, user, text, limit=SEARCH_LIMIT):
+        """Summaries of a user's offers whose client (CIF, name, address, phone) or one of
+        whose positions (code, name) matches text, newest first"""
+        match = match_expression(text)
+        if match is None:
+            return []
+        search = """
+            WITH matches(offer_id) AS (
+                SELECT rowid FROM offers_fts WHERE offers_fts MATCH ?
+                UNION
+                SELECT p.offer_id FROM offers_positions_fts pf
+                CROSS JOIN offers_positions p ON p.id = pf.rowid
+                WHERE offers_positions_fts MATCH ?
+            )
+            SELECT o.id, COALESCE(NULLIF(o.name, ''), o.cif), o.timestamp,
+                   COUNT(p.id),
+                   COALESCE(SUM(p.quantity * p.unit_price * (1 + p.vat / 100.0)), 0)
+            FROM (
+                SELECT o.id, o.cif, o.name, o.timestamp FROM matches m
+                CROSS JOIN offers o ON o.id = m.offer_id
+                WHERE o.user_id = ?
+                ORDER BY o.timestamp DESC, o.id DESC
+                LIMIT ?
+            ) o
+            LEFT JOIN offers_positions p ON p.offer_id = o.id
+            GROUP BY o.id
+            ORDER BY o.timestamp DESC, o.id DESC
+        """
+
+        with self.db.connection() as con:
+            rows = con.execute(search, (match, match, user.id, limit)).fetchall()
+
+        return [OfferSummary(*row) for row in rows]
+
+    def get_offer_by_id(self, offer_id):
+        """A single offer with its positions, looked up by primary key. None if it does not exist."""
         try:
-            get_offers = """ 
-                SELECT * FROM offers WHERE user_id =? ORDER BY timestamp DESC
+            get_offer = f"""
+                SELECT {OFFER_WITH_POSITIONS_COLUMNS}
+                FROM offers o
+                LEFT JOIN offers_positions p ON p.offer_id = o.id
+                WHERE o.id = ?
+                ORDER BY p.id
             """
 
-            cursor = self.db.con.cursor()
-
-            cursor.execute(get_offers,(user.id,))
-
-            offers = cursor.fetchall()
-
-            if not offers :
-                print("Error no data")
-                return []
+            with self.db.connection() as con:
+                rows = con.execute(get_offer, (offer_id,)).fetchall()
 
-            final_offers = []
-            for offer in offers:
-
-                get_positions_sql = """
-                    SELECT id, offer_id, product_code, product_name, quantity, unit_price, vat 
-                    FROM offers_positions 
-                    WHERE offer_id = ?
-                """
-                cursor.execute(get_positions_sql, (offer[0],))
-                positions_data = cursor.fetchall()
-
-
-                products = []
-                for p in positions_data:
-                    offer_pos = Offer_pos(
-                        id=p[0],
-                        offer_id=p[1],
-                        product_code=p[2],
-                        product_name=p[3],
-                        quantity=p[4],
-                        unit_price=p[5],
-                        vat=p[6]
-                    )
-                    products.append(offer_pos)
-
-                    
-                offer_obj = Offer(
-                    id=offer[0],
-                    cif=offer[1],
-                    name=offer[3],
-                    address=offer[4],
-                    phone=offer[5], 
-                    timestamp=offer[2],
-                    user_id=offer[6],
-                    products = products
-                )
-
-                final_offers.append(offer_obj)
+            offers = group_offer_rows(rows)
+            return offers[0] if offers else None
+        except Exception as e:
+            print(f"Error {e}")
+            return None
 
-            
-            print("Fetched Offers")
-            return final_offers
+    def get_offer_summaries_page(self, user, after=None, limit=PAGE_SIZE):
+        """One page of offer summaries as fetch_offer_summaries_page returns it, an empty last page when the query failed"""
+        try:
+            return self.fetch_offer_summaries_page(user, after, limit)
         except Exception as e:
             print(f"Error {e}")
-            return []
+            return [], None
+
+    def fetch_offer_summaries_page(self, user, after=None, limit=PAGE_SIZE):
+        """One page of offer summaries (newest first) for the saved offers list: client name
+        or CIF, position count and total with VAT, aggregated in SQL without loading positions.
+        Keyset pagination on (timestamp, id): after is the token returned with the previous
+        page. Returns (summaries, next_token), next_token is None on the last page."""
+        keyset = "AND (timestamp, id) < (?, ?)" if after else ""
+        get_summaries = f"""
+            SELECT o.id, COALESCE(NULLIF(o.name, ''), o.cif), o.timestamp,
+                   COUNT(p.id),
+                   COALESCE(SUM(p.quantity * p.unit_price * (1 + p.vat / 100.0)), 0)
+            FROM (
+                SELECT id, cif, name, timestamp FROM offers
+                WHERE user_id = ? {keyset}
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+            ) o
+            LEFT JOIN offers_positions p ON p.offer_id = o.id
+            GROUP BY o.id
+            ORDER BY o.timestamp DESC, o.id DESC
+        """
+
+        params = (user.id, *after, limit) if after else (user.id, limit)
+        with self.db.connection() as con:
+            rows = con.execute(get_summaries, params).fetchall()
+
+        summaries = [OfferSummary(*row) for row in rows]
+        next_token = None
+        if len(summaries) == limit:
+            next_token = (summaries[-1].timestamp, summaries[-1].id)
+        return summaries, next_token
+
+    def get_offers_by_user_by_id(self,id):
+        return self.load_offers_by_user_id(id)
+
+    
+    def get_offers_by_user(self, user):
+        return self.load_offers_by_user_id(user.id)
         
 
     def delete_offer(self, offer_id):
@@ -194,13 +243,11 @@ class OfferService:
         try:
             del_com1 = """DELETE FROM offers_positions WHERE offer_id =?"""
             del_com2 = """DELETE FROM offers WHERE id =?"""
-            cursor = self.db.con.cursor()
-            cursor.execute(del_com1,(offer_id,))
-            cursor.execute(del_com2,(offer_id,))
-            self.db.con.commit()
+            with self.db.connection() as con:
+                con.execute(del_com1,(offer_id,))
+                con.execute(del_com2,(offer_id,))
             return True
         except Exception as e:
-            self.db.con.rollback()
             print(f"Error: {e}")
             return False
 
@@ -212,12 +259,10 @@ class OfferService:
 
         try:
             del_com = """DELETE FROM offers_positions WHERE id =?"""
-            cursor = self.db.con.cursor()
-            cursor.execute(del_com,(product_id,))
-            self.db.con.commit()
+            with self.db.connection() as con:
+                con.execute(del_com,(product_id,))
             return True
         except Exception as e:
-            self.db.con.rollback()
             print(f"Error: {e}")
             return False
             
@@ -235,12 +280,10 @@ class OfferService:
                 VALUES (?, ?, ?, ?, ?, ?)
             """
 
-            cursor = self.db.con.cursor()
-            cursor.execute(new_offer_positions,(id,code,name,quantity,price,vat))
-            self.db.con.commit()
-            return True
+            with self.db.connection() as con:
+                position_id = con.execute(new_offer_positions,(id,code,name,quantity,price,vat)).lastrowid
+            return position_id
         except Exception as e:
-            self.db.con.rollback()
             print(f"Error {e}")
             return False
 
@@ -254,12 +297,10 @@ class OfferService:
                 UPDATE offers_positions SET product_code =?, product_name =?, quantity =?, unit_price =?, vat =?  WHERE id =?
             """
 
-            cursor = self.db.con.cursor()
-            cursor.execute(update_offer_positions,(code,name,quantity,price,vat,id_prod))
-            self.db.con.commit()
+            with self.db.connection() as con:
+                con.execute(update_offer_positions,(code,name,quantity,price,vat,id_prod))
             return True
         except Exception as e:
-            self.db.con.rollback()
             print(f"Error {e}")
             return False
 
@@ -0,0 +1,390 @@
+import gc
+import os
+import tempfile
+from datetime import datetime, date
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Flowable
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_LEFT, TA_CENTER
+from utils.pdf_merge import merge_pdfs
+
+# Sales per table in range reports, tables this size split across pages cheaply
+RANGE_TABLE_ROWS = 200
+# Sales per separately built part of a range report. ReportLab holds a document's
+# flowables and pages until it is written, so a part is the most held at a time.
+RANGE_PART_ROWS = 5000
+
+
+class ProgressMarker(Flowable):
+    """Zero-size flowable that calls back when the layout reaches it"""
+
+    def __init__(self, callback):
+        super().__init__()
+        self.callback = callback
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        self.callback()
+
+
+def render_day_report(file_path, username, day, sales, sales_count, total_amount, on_page=None):
+    """Daily sales report from already loaded data, so batch exports can render it in
+    another process"""
+    doc = SimpleDocTemplate(file_path, pagesize=A4, topMargin=2*cm, bottomMargin=2*cm)
+    styles = getSampleStyleSheet()
+    story = []
+
+    # Title
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        alignment=TA_CENTER,
+        spaceAfter=20
+    )
+    story.append(Paragraph(f"Daily Sales Report", title_style))
+
+    # Header info
+    header_style = ParagraphStyle(
+        'HeaderStyle',
+        parent=styles['Normal'],
+        fontSize=12,
+        alignment=TA_LEFT,
+        spaceAfter=10
+    )
+
+    story.append(Paragraph(f"<b>User:</b> {username}", header_style))
+    story.append(Paragraph(f"<b>Date:</b> {day.strftime('%A, %B %d, %Y')}", header_style))
+    story.append(Paragraph(f"<b>Total Sales:</b> {sales_count}", header_style))
+
+    story.append(Paragraph(f"<b>Total Amount:</b> {total_amount:.2f} RON", header_style))
+    story.append(Spacer(1, 20))
+
+    # Sales table
+    data = [['Nr.', 'Document', 'Amount (RON)', 'Time']]
+
+    for idx, sale in enumerate(sales, 1):
+        dt = datetime.fromisoformat(sale.timestamp)
+        data.append([
+            str(idx),
+            sale.doc,
+            f"{sale.amount:.2f}",
+            dt.strftime('%H:%M:%S')
+        ])
+
+    table = Table(data, colWidths=[1*cm, 8*cm, 3*cm, 3*cm])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('ALIGN', (1, 1), (1, -1), 'LEFT'),  # Document column left aligned
+        ('ALIGN', (2, 1), (2, -1), 'RIGHT'),  # Amount column right aligned
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+
+    story.append(table)
+    story.append(Spacer(1, 20))
+
+    # Summary
+    summary_style = ParagraphStyle(
+        'SummaryStyle',
+        parent=styles['Normal'],
+        fontSize=12,
+        alignment=TA_CENTER,
+        spaceAfter=10
+    )
+    story.append(Paragraph(f"<b>TOTAL: {total_amount:.2f} RON</b>", summary_style))
+    story.append(Paragraph(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+
+    if on_page is not None:
+        doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
+    else:
+        doc.build(story)
+
+
+class ReportService:
+    """Builds the daily and monthly sales PDF reports, meant to run as ExportService jobs"""
+
+    def __init__(self, sales_service):
+        self.sales_service = sales_service
+
+    def build_day_report(self, job, file_path, user, day):
+        sales = self.sales_service.get_sales_by_date(user, day)
+        sales_count, total_amount = self.sales_service.get_totals_by_date(user, day)
+        job.report(f"Rendering {sales_count} sales")
+        render_day_report(file_path, user.username, day, sales, sales_count, total_amount, job.on_page)
+
+    def build_month_report(self, job, file_path, user, year, month):
+        # Get all sales for the month, grouped per day in a single query
+        all_month_sales = self.sales_service.get_daily_sales_by_month(user, year, month)
+        total_days_with_sales = len(all_month_sales)
+        total_sales_count, total_month_amount = self.sales_service.get_totals_by_month(user, year, month)
+        job.report(f"0/{total_days_with_sales} days rendered", 0, total_days_with_sales)
+
+        doc = SimpleDocTemplate(file_path, pagesize=A4, topMargin=2*cm, bottomMargin=2*cm)
+        styles = getSampleStyleSheet()
+        story = []
+
+        # Title
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            alignment=TA_CENTER,
+            spaceAfter=20
+        )
+        story.append(Paragraph(f"Monthly Sales Report", title_style))
+
+        # Header info
+        header_style = ParagraphStyle(
+            'HeaderStyle',
+            parent=styles['Normal'],
+            fontSize=12,
+            alignment=TA_LEFT,
+            spaceAfter=10
+        )
+
+        story.append(Paragraph(f"<b>User:</b> {user.username}", header_style))
+        story.append(Paragraph(f"<b>Month:</b> {datetime(year, month, 1).strftime('%B %Y')}", header_style))
+
+        story.append(Paragraph(f"<b>Days with Sales:</b> {total_days_with_sales}", header_style))
+        story.append(Paragraph(f"<b>Total Sales:</b> {total_sales_count}", header_style))
+        story.append(Paragraph(f"<b>Total Amount:</b> {total_month_amount:.2f} RON", header_style))
+        story.append(Spacer(1, 20))
+
+        # Daily breakdown
+        day_style = ParagraphStyle(
+            'DayStyle',
+            parent=styles['Heading2'],
+            fontSize=14,
+            alignment=TA_LEFT,
+            spaceAfter=10,
+            spaceBefore=15
+        )
+
+        normal_style = ParagraphStyle(
+            'NormalStyle',
+            parent=styles['Normal'],
+            fontSize=10,
+            alignment=TA_LEFT,
+            spaceAfter=5
+        )
+
+        def day_rendered(days_done):
+            return lambda: job.report(
+                f"{days_done}/{total_days_with_sales} days rendered, page {job.pages}",
+                days_done
+            )
+
+        for days_done, (day, daily_count, daily_total, daily_sales) in enumerate(all_month_sales, 1):
+            # Day header
+            story.append(Paragraph(
+                f"{day.strftime('%A, %B %d, %Y')} - {daily_count} sales - {daily_total:.2f} RON",
+                day_style
+            ))
+
+            # Sales for that day
+            for idx, sale in enumerate(daily_sales, 1):
+                dt = datetime.fromisoformat(sale.timestamp)
+                story.append(Paragraph(
+                    f"&nbsp;&nbsp;&nbsp;&nbsp;{idx}. {sale.doc} - {sale.amount:.2f} RON ({dt.strftime('%H:%M')})",
+                    normal_style
+                ))
+
+            story.append(Spacer(1, 10))
+            story.append(ProgressMarker(day_rendered(days_done)))
+
+        # Final summary
+        summary_style = ParagraphStyle(
+            'SummaryStyle',
+            parent=styles['Normal'],
+            fontSize=12,
+            alignment=TA_CENTER,
+            spaceAfter=10,
+            spaceBefore=20
+        )
+        story.append(Paragraph(f"<b>MONTHLY TOTAL: {total_month_amount:.2f} RON</b>", summary_style))
+        story.append(Paragraph(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+
+        doc.build(story, onFirstPage=job.on_page, onLaterPages=job.on_page)
+
+    def build_year_report(self, job, file_path, user, year):
+        self.build_range_report(job, file_path, user, date(year, 1, 1), date(year + 1, 1, 1), str(year))
+
+    def build_range_report(self, job, file_path, user, start, end, period_text):
+        """Sales of [start, end) in month sections of RANGE_TABLE_ROWS-row tables with a
+        subtotal per month.
+
+        Sales are streamed oldest first from a keyset cursor. Every RANGE_PART_ROWS sales
+        the story so far is built into a part file of its own with doc.build, then the
+        parts are joined by merge_pdfs, which writes them out one at a time, so memory
+        stays flat whatever the number of sales; build/check_report_memory.py checks it.
+        A new part starts on a new page, with the month's table header repeated."""
+        sales_count, total_amount = self.sales_service.get_totals_between(user, start, end)
+        job.report(f"0/{sales_count} sales rendered", 0, sales_count)
+
+        styles = getSampleStyleSheet()
+
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            alignment=TA_CENTER,
+            spaceAfter=20
+        )
+        header_style = ParagraphStyle(
+            'HeaderStyle',
+            parent=styles['Normal'],
+            fontSize=12,
+            alignment=TA_LEFT,
+            spaceAfter=10
+        )
+        month_style = ParagraphStyle(
+            'MonthStyle',
+            parent=styles['Heading2'],
+            fontSize=14,
+            alignment=TA_LEFT,
+            spaceAfter=10,
+            spaceBefore=15
+        )
+        subtotal_style = ParagraphStyle(
+            'SubtotalStyle',
+            parent=styles['Normal'],
+            fontSize=11,
+            alignment=TA_LEFT,
+            spaceBefore=6,
+            spaceAfter=10
+        )
+        summary_style = ParagraphStyle(
+            'SummaryStyle',
+            parent=styles['Normal'],
+            fontSize=12,
+            alignment=TA_CENTER,
+            spaceAfter=10,
+            spaceBefore=20
+        )
+        table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('ALIGN', (2, 1), (2, -1), 'LEFT'),  # Document column left aligned
+            ('ALIGN', (3, 1), (3, -1), 'RIGHT'),  # Amount column right aligned
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black)
+        ])
+        header_row = ['Nr.', 'Date', 'Document', 'Amount (RON)']
+
+        def rows_rendered(rows_done):
+            return lambda: job.report(
+                f"{rows_done}/{sales_count} sales rendered, page {job.pages}",
+                rows_done
+            )
+
+        def sales_table(rows):
+            table = Table([header_row] + rows, colWidths=[1.5*cm, 4*cm, 8*cm, 3*cm], repeatRows=1)
+            table.setStyle(table_style)
+            return table
+
+        def month_end(month, month_count, month_total):
+            return Paragraph(
+                f"<b>{month.strftime('%B %Y')}: {month_count} sales - {month_total:.2f} RON</b>",
+                subtotal_style
+            )
+
+        def story():
+            yield Paragraph("Sales Report", title_style)
+            yield Paragraph(f"<b>User:</b> {user.username}", header_style)
+            yield Paragraph(f"<b>Period:</b> {period_text}", header_style)
+            yield Paragraph(f"<b>Total Sales:</b> {sales_count}", header_style)
+            yield Paragraph(f"<b>Total Amount:</b> {total_amount:.2f} RON", header_style)
+            yield Spacer(1, 10)
+
+            month = None
+            month_count = 0
+            month_total = 0.0
+            rows = []
+            rows_done = 0
+            part_rows = 0
+            for sale in self.sales_service.iter_sales_between(user, start, end, oldest_first=True):
+                dt = datetime.fromisoformat(sale.timestamp)
+                sale_month = dt.date().replace(day=1)
+                if sale_month != month:
+                    if rows:
+                        yield sales_table(rows)
+                        part_rows += len(rows)
+                        rows = []
+                    if month is not None:
+                        yield month_end(month, month_count, month_total)
+                        yield ProgressMarker(rows_rendered(rows_done))
+                    month = sale_month
+                    month_count = 0
+                    month_total = 0.0
+                    yield Paragraph(month.strftime('%B %Y'), month_style)
+
+                month_count += 1
+                month_total += sale.amount
+                rows_done += 1
+                rows.append([
+                    str(month_count),
+                    dt.strftime('%d.%m %H:%M'),
+                    sale.doc,
+                    f"{sale.amount:.2f}"
+                ])
+                if len(rows) == RANGE_TABLE_ROWS:
+                    yield sales_table(rows)
+                    yield ProgressMarker(rows_rendered(rows_done))
+                    part_rows += len(rows)
+                    rows = []
+                    if part_rows >= RANGE_PART_ROWS:
+                        # end of a part
+                        yield None
+                        part_rows = 0
+
+            if rows:
+                yield sales_table(rows)
+            if month is not None:
+                yield month_end(month, month_count, month_total)
+                yield ProgressMarker(rows_rendered(rows_done))
+
+            yield Paragraph(f"<b>TOTAL: {total_amount:.2f} RON</b>", summary_style)
+            yield Paragraph(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal'])
+
+        def parts():
+            part = []
+            for flowable in story():
+                if flowable is None:
+                    yield part
+                    part = []
+                else:
+                    part.append(flowable)
+            yield part
+
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(file_path))) as part_dir:
+            part_paths = []
+            for part in parts():
+                part_path = os.path.join(part_dir, f"part_{len(part_paths)}.pdf")
+                doc = SimpleDocTemplate(part_path, pagesize=A4, topMargin=2*cm, bottomMargin=2*cm)
+                doc.build(part, onFirstPage=job.on_page, onLaterPages=job.on_page)
+                part_paths.append(part_path)
+                # a built document is a reference cycle, free it before the next part
+                del doc
+                gc.collect()
+
+            if len(part_paths) == 1:
+                os.replace(part_paths[0], file_path)
+            else:
+                job.report(f"Joining {len(part_paths)} parts, {job.pages} pages")
+                merged_path = os.path.join(part_dir, "merged.pdf")
+                merge_pdfs(part_paths, merged_path)
+                os.replace(merged_path, file_path)
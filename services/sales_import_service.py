@@ -0,0 +1,107 @@
+import csv
+import math
+from datetime import datetime
+
+REQUIRED_COLUMNS = ('doc', 'amount', 'timestamp')
+MAX_REPORTED_ERRORS = 100
+SNIFF_BYTES = 4096
+
+
+class ImportResult:
+    def __init__(self):
+        self.imported = 0
+        self.bad_lines = 0
+        self.errors = []
+        # Set when the import stopped early, only the first `imported` sales were saved
+        self.failure = None
+
+    def add_error(self, line_no, message):
+        self.bad_lines += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_no, message))
+
+
+class SalesImportService:
+    """Streams till exports (CSV with doc, amount, timestamp columns) into SalesService.create_sales_bulk"""
+
+    def __init__(self, sales_service):
+        self.sales_service = sales_service
+
+    def import_csv(self, file_path, user, on_progress=None):
+        """Import the file, on_progress(imported) is called after every saved batch"""
+        result = ImportResult()
+
+        def batch_saved(inserted):
+            result.imported = inserted
+            if on_progress is not None:
+                on_progress(inserted)
+
+        try:
+            with open(file_path, newline='', encoding='utf-8-sig') as f:
+                sample = f.read(SNIFF_BYTES)
+                f.seek(0)
+                try:
+                    dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+                except csv.Error:
+                    dialect = csv.excel
+
+                reader = csv.DictReader(f, dialect=dialect)
+                header = [c.strip().lower() for c in (reader.fieldnames or [])]
+                missing = [c for c in REQUIRED_COLUMNS if c not in header]
+                if missing:
+                    result.add_error(1, f"Missing columns: {', '.join(missing)}")
+                    return result
+                reader.fieldnames = header
+
+                rows = self.parse_rows(reader, result)
+                result.imported = self.sales_service.create_sales_bulk(rows, user, on_batch=batch_saved)
+        except Exception as e:
+            print(f"Error {e}")
+            result.failure = str(e)
+        return result
+
+    def parse_rows(self, reader, result):
+        """Yield valid (doc, amount, sale_datetime) tuples, recording bad lines in result"""
+        for row in reader:
+            line_no = reader.line_num
+            try:
+                doc = (row.get('doc') or '').strip()
+                if not doc:
+                    raise ValueError("empty document number")
+                yield doc, parse_amount(row.get('amount')), parse_timestamp(row.get('timestamp'))
+            except ValueError as e:
+                result.add_error(line_no, str(e))
+
+
+def parse_amount(value):
+    value = (value or '').strip().replace(' ', '')
+    if ',' in value and '.' not in value:
+        value = value.replace(',', '.')
+    try:
+        amount = float(value)
+    except ValueError:
+        raise ValueError(f"invalid amount '{value}'")
+    # float() also parses nan and inf, which would poison every total they are added to
+    if not math.isfinite(amount):
+        raise ValueError(f"invalid amount '{value}'")
+    return amount
+
+
+def parse_timestamp(value):
+    value = (value or '').strip()
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    else:
+        # Sales are stored as naive local time, an offset would make SQLite's date() file
+        # the sale under its UTC day while the list shows it under the local one
+        if dt.tzinfo is not None:
+            dt = dt.astimezone().replace(tzinfo=None)
+        return dt
+    for fmt in ('%d.%m.%Y %H:%M:%S', '%d.%m.%Y %H:%M', '%d.%m.%Y', '%d/%m/%Y %H:%M', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"invalid timestamp '{value}'")
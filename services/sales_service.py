@@ -1,13 +1,31 @@
 from database.connection import Database
-from datetime import datetime 
+from datetime import datetime, date, timedelta
 import sqlite3
+from itertools import islice
 from models.sale import Sale
+from database.fts import match_expression, SEARCH_LIMIT
+
+BULK_BATCH_SIZE = 5000
+PAGE_SIZE = 100
+# Rows fetched per query while streaming a range
+STREAM_BATCH_SIZE = 2000
+
+def month_range(year, month):
+    """First day of the month and first day of the next one, for half-open range queries"""
+    start = date(year, month, 1)
+    if month == 12:
+        end = date(year + 1, 1, 1)
+    else:
+        end = date(year, month + 1, 1)
+    return start, end
+
 
 class SalesService:
     def __init__(self,db_instance):
         self.db = db_instance
 
     def create_sale(self, doc, amount, user,sale_date=None):
+        """Insert one sale, returns the new Sale or None when it could not be saved"""
         try:
             if sale_date:
                 new_timestamp = datetime.combine(sale_date, datetime.now().time()).isoformat()
@@ -22,16 +40,42 @@ class SalesService:
 
             values = (doc, amount, new_timestamp, user.id)
 
-            self.db.con.execute(new_sale,values)
-            self.db.con.commit()
-            return True
+            with self.db.connection() as con:
+                sale_id = con.execute(new_sale,values).lastrowid
+            return Sale(id=sale_id, doc=doc, amount=amount, timestamp=new_timestamp, user_id=user.id)
         except sqlite3.IntegrityError:
             print("Error db")
-            return False
+            return None
         except Exception as e:
-            self.db.con.rollback()
             print(f"Error {e}")
-            return False
+            return None
+
+    def create_sales_bulk(self, sales, user, batch_size=BULK_BATCH_SIZE, on_batch=None):
+        """Insert (doc, amount, sale_datetime) tuples with executemany, one transaction per batch.
+        sales can be any iterable, it is consumed batch by batch. on_batch(inserted) is called
+        after every committed batch. Returns the number of rows inserted; a failing batch is
+        rolled back and its error raised, the batches before it stay committed."""
+        new_sale = """ 
+        INSERT INTO sales (doc, amount, timestamp, user_id)
+        VALUES (?, ?, ?, ?)
+        """
+
+        inserted = 0
+        sales = iter(sales)
+        while True:
+            batch = [
+                (doc, amount, sale_datetime.isoformat(), user.id)
+                for doc, amount, sale_datetime in islice(sales, batch_size)
+            ]
+            if not batch:
+                break
+
+            with self.db.connection() as con:
+                con.executemany(new_sale, batch)
+            inserted += len(batch)
+            if on_batch is not None:
+                on_batch(inserted)
+        return inserted
 
 
     
@@ -41,11 +85,8 @@ class SalesService:
                 SELECT * FROM sales WHERE user_id =? ORDER BY timestamp DESC
             """
 
-            cursor = self.db.con.cursor()
-
-            cursor.execute(get_sales,(user.id,))
-
-            rows = cursor.fetchall()
+            with self.db.connection() as con:
+                rows = con.execute(get_sales,(user.id,)).fetchall()
 
             if not rows :
                 print("Error no data")
@@ -65,50 +106,106 @@ class SalesService:
             print(f"Error {e}")
             return []
 
-    def get_sales_by_month(self, user,year, month):
-        try:
-            get_sales = """
+    def fetch_sales_page(self, user, start=None, end=None, after=None, limit=PAGE_SIZE, oldest_first=False):
+        """One page of a user's sales (newest first unless oldest_first), optionally limited
+        to [start, end). Keyset pagination on (timestamp, id): after is the token returned
+        with the previous page. Returns (sales, next_token), next_token is None on the last
+        page. Query errors are raised."""
+        conditions = ["user_id = ?"]
+        params = [user.id]
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            conditions.append("timestamp < ?")
+            params.append(end.isoformat())
+        if after:
+            conditions.append("(timestamp, id) > (?, ?)" if oldest_first else "(timestamp, id) < (?, ?)")
+            params.extend(after)
+        params.append(limit)
+        order = "ASC" if oldest_first else "DESC"
+
+        get_sales = f"""
             SELECT * FROM sales
-            WHERE user_id = ? AND strftime('%Y', timestamp) = ? AND strftime('%m', timestamp) = ? ORDER BY timestamp DESC
+            WHERE {' AND '.join(conditions)}
+            ORDER BY timestamp {order}, id {order}
+            LIMIT ?
         """
 
-            cursor = self.db.con.cursor()
+        with self.db.connection() as con:
+            rows = con.execute(get_sales, params).fetchall()
 
-            cursor.execute(get_sales, (user.id, str(year), f'{month:02d}'))
+        sales = []
+        for row in rows:
+            sale = Sale(
+                id=row[0],
+                doc=row[1],
+                amount=row[2],
+                timestamp=row[3],
+                user_id=row[4]
+            )
+            sales.append(sale)
 
-            rows = cursor.fetchall()
+        next_token = None
+        if len(sales) == limit:
+            next_token = (sales[-1].timestamp, sales[-1].id)
+        return sales, next_token
 
-            if not rows :
-                print("Error no data")
-                return []
-            sales = []
-            for row in rows:
-                sale = Sale(
-                    id=row[0],
-                    doc=row[1],
-                    amount=row[2],
-                    timestamp=row[3],
-                    user_id=row[4]
-                )
-                sales.append(sale)
-            return sales
+    def get_sales_page(self, user, start=None, end=None, after=None, limit=PAGE_SIZE, oldest_first=False):
+        """One page of sales as fetch_sales_page returns it, an empty last page when the query failed"""
+        try:
+            return self.fetch_sales_page(user, start, end, after, limit, oldest_first)
         except Exception as e:
             print(f"Error {e}")
+            return [], None
+
+    def iter_sales_between(self, user, start, end, after=None, batch_size=STREAM_BATCH_SIZE, oldest_first=False):
+        """Sales of [start, end) newest first (or oldest first), fetched batch_size rows at
+        a time with keyset pages so only one batch is ever held in memory. Query errors
+        are raised, a stream is never cut short silently."""
+        while True:
+            sales, after = self.fetch_sales_page(user, start, end, after=after, limit=batch_size, oldest_first=oldest_first)
+            yield from sales
+            if after is None:
+                return
+
+    def search_sales(self, user, text, limit=SEARCH_LIMIT):
+        """The newest sales of a user, by (timestamp, id), whose document matches text (word
+        prefixes). CROSS JOIN keeps the FTS lookup as the outer loop, otherwise SQLite may
+        walk the user's sales and run the MATCH once per row; the matches are then ranked
+        by timestamp with a top-limit sort, so a back-dated import cannot push newer sales
+        out of the result."""
+        match = match_expression(text)
+        if match is None:
             return []
+        try:
+            search = """
+            SELECT s.* FROM sales_fts f
+            CROSS JOIN sales s ON s.id = f.rowid
+            WHERE sales_fts MATCH ? AND s.user_id = ?
+            ORDER BY s.timestamp DESC, s.id DESC
+            LIMIT ?
+        """
 
-    def get_sales_by_year(self, user, year):
+            with self.db.connection() as con:
+                rows = con.execute(search, (match, user.id, limit)).fetchall()
+
+            return [Sale(id=row[0], doc=row[1], amount=row[2], timestamp=row[3], user_id=row[4]) for row in rows]
+        except Exception as e:
+            print(f"Error {e}")
+            return []
 
+    def get_sales_between(self, user, start, end):
+        """Sales of a user with start <= timestamp < end, served by idx_sales_user_timestamp"""
         try:
             get_sales = """
             SELECT * FROM sales
-            WHERE user_id = ? AND strftime('%Y', timestamp) = ? ORDER BY timestamp DESC
+            WHERE user_id = ? AND timestamp >= ? AND timestamp < ?
+            ORDER BY timestamp DESC
         """
 
-            cursor = self.db.con.cursor()
-
-            cursor.execute(get_sales, (user.id, str(year)))
-
-            rows = cursor.fetchall()
+            with self.db.connection() as con:
+                rows = con.execute(get_sales, (user.id, start.isoformat(), end.isoformat())).fetchall()
 
             if not rows :
                 print("Error no data")
@@ -127,41 +224,119 @@ class SalesService:
         except Exception as e:
             print(f"Error {e}")
             return []
-        
+
+    def get_sales_by_month(self, user,year, month):
+        start, end = month_range(year, month)
+        return self.get_sales_between(user, start, end)
+
+    def get_sales_by_year(self, user, year):
+        return self.get_sales_between(user, date(year, 1, 1), date(year + 1, 1, 1))
 
     def get_sales_by_date(self, user, date):
-        
+        return self.get_sales_between(user, date, date + timedelta(days=1))
+
+
+    def get_daily_sales_between(self, user, start, end):
+        """Sales in [start, end) grouped per day as (day, count, total, sales), in one query"""
         try:
             get_sales = """
-            SELECT * FROM sales
-            WHERE user_id = ? AND date(timestamp) = ?
-            ORDER BY timestamp DESC
+            SELECT id, doc, amount, timestamp, user_id,
+                date(timestamp) AS day,
+                COUNT(*) OVER (PARTITION BY date(timestamp)) AS day_count,
+                SUM(amount) OVER (PARTITION BY date(timestamp)) AS day_total
+            FROM sales
+            WHERE user_id = ? AND timestamp >= ? AND timestamp < ?
+            ORDER BY day ASC, timestamp DESC
         """
 
-            cursor = self.db.con.cursor()
-
-            cursor.execute(get_sales, (user.id, date.isoformat()))
-
-            rows = cursor.fetchall()
+            with self.db.connection() as con:
+                rows = con.execute(get_sales, (user.id, start.isoformat(), end.isoformat())).fetchall()
 
             if not rows :
                 print("Error no data")
                 return []
-            sales = []
+            days = []
+            current_day = None
             for row in rows:
-                sale = Sale(
+                if row[5] != current_day:
+                    current_day = row[5]
+                    day_sales = []
+                    days.append((date.fromisoformat(row[5]), row[6], row[7], day_sales))
+                day_sales.append(Sale(
                     id=row[0],
                     doc=row[1],
                     amount=row[2],
                     timestamp=row[3],
                     user_id=row[4]
-                )
-                sales.append(sale)
-            return sales
+                ))
+            return days
         except Exception as e:
             print(f"Error {e}")
             return []
-    
+
+    def get_daily_sales_by_month(self, user, year, month):
+        start, end = month_range(year, month)
+        return self.get_daily_sales_between(user, start, end)
+
+
+    def get_totals_between(self, user, start, end):
+        """(count, total) of a user's sales for days in [start, end), read from sales_daily_rollup"""
+        try:
+            get_totals = """
+            SELECT COALESCE(SUM(sale_count), 0), COALESCE(SUM(total_amount), 0)
+            FROM sales_daily_rollup
+            WHERE user_id = ? AND day >= ? AND day < ?
+        """
+
+            with self.db.connection() as con:
+                count, total = con.execute(get_totals, (user.id, start.isoformat(), end.isoformat())).fetchone()
+
+            return count, total
+        except Exception as e:
+            print(f"Error {e}")
+            return 0, 0.0
+
+    def fetch_daily_totals_between(self, user, start, end):
+        """(day, count, total) of every day in [start, end) with sales, oldest first, read
+        from sales_daily_rollup. Query errors are raised."""
+        get_totals = """
+            SELECT day, sale_count, total_amount
+            FROM sales_daily_rollup
+            WHERE user_id = ? AND day >= ? AND day < ?
+            ORDER BY day ASC
+        """
+
+        with self.db.connection() as con:
+            rows = con.execute(get_totals, (user.id, start.isoformat(), end.isoformat())).fetchall()
+        return [(date.fromisoformat(day), count, total) for day, count, total in rows]
+
+    def get_range_stats(self, user, start, end):
+        """(count, total, min amount, max amount, days with sales) of a user's sales for days
+        in [start, end), one query over sales_daily_rollup. min and max are None without sales."""
+        try:
+            get_stats = """
+            SELECT COALESCE(SUM(sale_count), 0), COALESCE(SUM(total_amount), 0),
+                MIN(min_amount), MAX(max_amount), COUNT(*)
+            FROM sales_daily_rollup
+            WHERE user_id = ? AND day >= ? AND day < ?
+        """
+
+            with self.db.connection() as con:
+                return con.execute(get_stats, (user.id, start.isoformat(), end.isoformat())).fetchone()
+        except Exception as e:
+            print(f"Error {e}")
+            return 0, 0.0, None, None, 0
+
+    def get_totals_by_date(self, user, date):
+        return self.get_totals_between(user, date, date + timedelta(days=1))
+
+    def get_totals_by_month(self, user, year, month):
+        start, end = month_range(year, month)
+        return self.get_totals_between(user, start, end)
+
+    def get_totals_by_year(self, user, year):
+        return self.get_totals_between(user, date(year, 1, 1), date(year + 1, 1, 1))
+
 
     def delete_sale(self,id):
         if not id:
@@ -170,11 +345,9 @@ class SalesService:
         
         try:
             del_com = """DELETE FROM sales WHERE id =?"""
-            cursor = self.db.con.cursor()
-            cursor.execute(del_com,(id,))
-            self.db.con.commit()
+            with self.db.connection() as con:
+                con.execute(del_com,(id,))
             return True
         except Exception as e:
-            self.db.con.rollback()
             print(f"Error no data: {e}")
             return False
\ No newline at end of file
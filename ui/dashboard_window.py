@@ -1,13 +1,36 @@
 import customtkinter as ctk
 from tkinter import ttk, messagebox, filedialog
 from datetime import date, datetime, timedelta
-from ui.offer_window import OfferDetailWindow
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
+import calendar
+import os
+import threading
+from services.sales_import_service import SalesImportService
+from services.background_service import BackgroundService
+from services.export_service import ExportService
+from services.sales_service import PAGE_SIZE as SALES_PAGE_SIZE, month_range
+from services.offer_service import PAGE_SIZE as OFFERS_PAGE_SIZE
+from database.fts import SEARCH_LIMIT
+from ui.future_dispatcher import FutureDispatcher
+from ui.virtual_table import VirtualTable
+from ui.export_progress import ExportProgressPanel
+
+# Pause after the last keystroke before the search box queries the index
+SEARCH_DEBOUNCE_MS = 250
+
+# How often a running CSV import's saved count is shown
+IMPORT_PROGRESS_MS = 200
+
+SALES_TAB = "Sales Management"
+OFFERS_TAB = "Offers Management"
+
+# Labels of the sales list period modes, keyed by date_filter_mode
+DATE_FILTER_MODES = {
+    "day": "Day",
+    "week": "Week",
+    "month": "Month",
+    "year": "Year",
+    "custom": "Range",
+}
 
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
@@ -18,6 +41,14 @@ class DashboardWindow(ctk.CTk):
         self.user = user
         self.sales_service = sales_service
         self.offer_service = offer_service
+        self.background = BackgroundService(sales_service, offer_service)
+        self.dispatcher = FutureDispatcher(self)
+        self.exports = ExportService()
+        self.report_service = None
+        self.offer_document_service = None
+        self.batch_export_service = None
+        # The get_*_service getters run on the Tk thread and on export workers alike
+        self.lazy_services_lock = threading.Lock()
         
       
         self.colors = {
@@ -36,6 +67,12 @@ class DashboardWindow(ctk.CTk):
         self.end_date = None
         self.current_offer_positions = []
         self.saved_offers = []
+        self.sales_next_token = None
+        self.offers_next_token = None
+        self.search_text = ""
+        self.search_after_id = None
+        self.built_tabs = set()
+        self.import_progress = None
         
         self.title(f"Sales & Offers Dashboard - {user.username}")
         self.geometry("1200x800")
@@ -43,17 +80,32 @@ class DashboardWindow(ctk.CTk):
         self.configure(fg_color=self.colors['primary'])
         
         self.create_widgets()
-        self.after_idle(self.initial_data_load)
+        self.bind('<F12>', self.print_sql_stats)
 
-    def initial_data_load(self):
-        self.refresh_sales_list()
-        self.load_saved_offers()
+    def print_sql_stats(self, event=None):
+        stats = self.sales_service.db.stats
+        if stats is None:
+            print("SQL statistics are off, start with SALESAPP_SLOW_QUERY_MS set")
+            return
+        print(stats.report())
+        cache = getattr(self.offer_service, 'cache', None)
+        if cache is not None:
+            print(f"Offer cache: {cache.stats()}")
+        if self.offer_document_service is not None:
+            print(f"PDF cache: {self.offer_document_service.cache.stats()}")
+
+    def destroy(self):
+        self.dispatcher.cancel_all()
+        self.background.shutdown()
+        self.exports.shutdown()
+        super().destroy()
         
     def create_widgets(self):
         main_container = ctk.CTkFrame(self, fg_color="transparent")
         main_container.pack(fill="both", expand=True, padx=20, pady=20)
         
         self.create_header(main_container)
+        self.export_panel = ExportProgressPanel(main_container, self.exports, self.colors)
         
         self.notebook = ctk.CTkTabview(
             main_container,
@@ -62,15 +114,32 @@ class DashboardWindow(ctk.CTk):
             segmented_button_selected_color=self.colors['accent'],
             text_color=self.colors['primary'],
             segmented_button_unselected_color=self.colors['dark_gray'],
-            segmented_button_unselected_hover_color=self.colors['text_secondary']
+            segmented_button_unselected_hover_color=self.colors['text_secondary'],
+            command=self.on_tab_changed
         )
         self.notebook.pack(fill="both", expand=True, pady=(15, 0))
         
-        self.sales_tab = self.notebook.add("Sales Management")
-        self.offers_tab = self.notebook.add("Offers Management")
+        self.sales_tab = self.notebook.add(SALES_TAB)
+        self.offers_tab = self.notebook.add(OFFERS_TAB)
         
-        self.setup_sales_tab()
-        self.setup_offers_tab()
+        # Only the sales tab is built up front, the offers tab on first show
+        self.ensure_tab(SALES_TAB)
+
+    def on_tab_changed(self):
+        self.ensure_tab(self.notebook.get())
+
+    def ensure_tab(self, name):
+        """Build a tab's widgets the first time it is shown and queue its data load for
+        once the window has drawn them"""
+        if name in self.built_tabs:
+            return
+        self.built_tabs.add(name)
+        if name == SALES_TAB:
+            self.setup_sales_tab()
+            self.after_idle(self.refresh_sales_list)
+        elif name == OFFERS_TAB:
+            self.setup_offers_tab()
+            self.after_idle(self.load_saved_offers)
         
     def create_header(self, parent):
         header_frame = ctk.CTkFrame(
@@ -112,6 +181,16 @@ class DashboardWindow(ctk.CTk):
         )
         date_label.pack(anchor="e")
         
+        self.search_entry = ctk.CTkEntry(
+            header_frame,
+            width=280,
+            height=35,
+            placeholder_text="Search documents, clients, products..."
+        )
+        self.search_entry.pack(side="right", padx=10)
+        self.search_entry.bind('<KeyRelease>', self.on_search_changed)
+        self.search_entry.bind('<Escape>', self.clear_search)
+        
     def setup_sales_tab(self):
         sales_container = ctk.CTkFrame(self.sales_tab, fg_color="transparent")
         sales_container.pack(fill="both", expand=True, padx=15, pady=15)
@@ -128,7 +207,7 @@ class DashboardWindow(ctk.CTk):
     def create_date_filter_section(self, parent):
         filter_container = ctk.CTkFrame(
             parent, 
-            height=100,
+            height=150,
             fg_color=self.colors['light_gray'],
             corner_radius=0,
             border_width=1,
@@ -146,28 +225,28 @@ class DashboardWindow(ctk.CTk):
         title_label.pack(pady=(15, 10))
         
         controls_frame = ctk.CTkFrame(filter_container, fg_color="transparent")
-        controls_frame.pack(fill="x", padx=20, pady=(0, 15))
+        controls_frame.pack(fill="x", padx=20, pady=(0, 10))
         
         nav_frame = ctk.CTkFrame(controls_frame, fg_color="transparent")
         nav_frame.pack(side="left", padx=(0, 15))
         
-        prev_btn = ctk.CTkButton(
+        self.prev_btn = ctk.CTkButton(
             nav_frame,
             text="< Previous Day",
-            width=120,
+            width=130,
             height=35,
             command=self.navigate_previous,
             fg_color=self.colors['dark_gray'],
             text_color=self.colors['primary'],
             hover_color=self.colors['text_secondary']
         )
-        prev_btn.pack(side="left", padx=2)
+        self.prev_btn.pack(side="left", padx=2)
         
         self.date_display = ctk.CTkLabel(
             nav_frame,
             text=self.get_date_display_text(),
             font=("Arial", 12, "bold"),
-            width=180,
+            width=220,
             height=35,
             fg_color=self.colors['accent'],
             text_color=self.colors['primary'],
@@ -175,17 +254,17 @@ class DashboardWindow(ctk.CTk):
         )
         self.date_display.pack(side="left", padx=10)
         
-        next_btn = ctk.CTkButton(
+        self.next_btn = ctk.CTkButton(
             nav_frame,
             text="Next Day >",
-            width=120,
+            width=130,
             height=35,
             command=self.navigate_next,
             fg_color=self.colors['dark_gray'],
             text_color=self.colors['primary'],
             hover_color=self.colors['text_secondary']
         )
-        next_btn.pack(side="left", padx=2)
+        self.next_btn.pack(side="left", padx=2)
         
         action_frame = ctk.CTkFrame(controls_frame, fg_color="transparent")
         action_frame.pack(side="right")
@@ -202,6 +281,51 @@ class DashboardWindow(ctk.CTk):
         )
         today_btn.pack(side="left", padx=5)
         
+        mode_frame = ctk.CTkFrame(filter_container, fg_color="transparent")
+        mode_frame.pack(fill="x", padx=20, pady=(0, 15))
+        
+        self.mode_selector = ctk.CTkSegmentedButton(
+            mode_frame,
+            values=list(DATE_FILTER_MODES.values()),
+            command=self.set_date_filter_mode,
+            height=30,
+            selected_color=self.colors['accent'],
+            unselected_color=self.colors['dark_gray']
+        )
+        self.mode_selector.set(DATE_FILTER_MODES[self.date_filter_mode])
+        self.mode_selector.pack(side="left")
+        
+        self.custom_range_frame = ctk.CTkFrame(mode_frame, fg_color="transparent")
+        
+        ctk.CTkLabel(
+            self.custom_range_frame,
+            text="From:",
+            font=("Arial", 12),
+            text_color=self.colors['secondary']
+        ).pack(side="left", padx=(15, 5))
+        self.range_start_entry = ctk.CTkEntry(self.custom_range_frame, width=100, placeholder_text="YYYY-MM-DD")
+        self.range_start_entry.pack(side="left")
+        
+        ctk.CTkLabel(
+            self.custom_range_frame,
+            text="To:",
+            font=("Arial", 12),
+            text_color=self.colors['secondary']
+        ).pack(side="left", padx=(10, 5))
+        self.range_end_entry = ctk.CTkEntry(self.custom_range_frame, width=100, placeholder_text="YYYY-MM-DD")
+        self.range_end_entry.pack(side="left")
+        
+        ctk.CTkButton(
+            self.custom_range_frame,
+            text="Apply",
+            width=70,
+            height=30,
+            command=self.apply_custom_range,
+            fg_color=self.colors['dark_gray'],
+            text_color=self.colors['primary'],
+            hover_color=self.colors['text_secondary']
+        ).pack(side="left", padx=10)
+        
     def create_sales_input_panel(self, parent):
 
         scrollable_input = ctk.CTkScrollableFrame(parent, width=400)
@@ -376,7 +500,46 @@ class DashboardWindow(ctk.CTk):
             text_color=self.colors['primary'],
             hover_color=self.colors['text_secondary']
         )
-        export_month_btn.pack()
+        export_month_btn.pack(pady=(0, 5))
+
+        export_period_btn = ctk.CTkButton(
+            buttons_frame,
+            text="Export Period PDF",
+            command=self.export_period_pdf,
+            width=410,
+            height=40,
+            font=("Arial", 12),
+            fg_color=self.colors['accent'],
+            text_color=self.colors['primary'],
+            hover_color=self.colors['text_secondary']
+        )
+        export_period_btn.pack(pady=(0, 5))
+
+        export_days_btn = ctk.CTkButton(
+            buttons_frame,
+            text="Export Period Day PDFs",
+            command=self.export_period_day_pdfs,
+            width=410,
+            height=40,
+            font=("Arial", 12),
+            fg_color=self.colors['accent'],
+            text_color=self.colors['primary'],
+            hover_color=self.colors['text_secondary']
+        )
+        export_days_btn.pack(pady=(0, 5))
+
+        import_csv_btn = ctk.CTkButton(
+            buttons_frame,
+            text="Import Sales CSV",
+            command=self.import_sales_csv,
+            width=410,
+            height=40,
+            font=("Arial", 12),
+            fg_color=self.colors['dark_gray'],
+            text_color=self.colors['primary'],
+            hover_color=self.colors['text_secondary']
+        )
+        import_csv_btn.pack()
         
         self.doc_entry.bind('<Tab>', lambda e: (self.amount_entry.focus_set(), 'break')[1])
         self.amount_entry.bind('<Return>', lambda e: self.save_sale())
@@ -437,14 +600,6 @@ class DashboardWindow(ctk.CTk):
         style.map("Custom.Treeview.Heading",
                  background=[('active', self.colors['text_secondary'])])
         
-        columns = ('ID', 'Document', 'Amount', 'Date', 'Time')
-        self.sales_tree = ttk.Treeview(
-            tree_container, 
-            columns=columns, 
-            show='headings',
-            style="Custom.Treeview"
-        )
-        
         column_configs = {
             'ID': (60, 'center'),
             'Document': (180, 'w'),
@@ -453,15 +608,15 @@ class DashboardWindow(ctk.CTk):
             'Time': (100, 'center')
         }
         
-        for col, (width, anchor) in column_configs.items():
-            self.sales_tree.heading(col, text=col)
-            self.sales_tree.column(col, width=width, anchor=anchor)
-        
-        v_scrollbar = ttk.Scrollbar(tree_container, orient="vertical", command=self.sales_tree.yview)
-        self.sales_tree.configure(yscrollcommand=v_scrollbar.set)
+        self.sales_tree = VirtualTable(
+            tree_container,
+            column_configs,
+            style="Custom.Treeview",
+            on_near_end=self.load_more_sales
+        )
         
-        self.sales_tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
-        v_scrollbar.pack(side="right", fill="y", pady=10)
+        self.sales_tree.tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+        self.sales_tree.scrollbar.pack(side="right", fill="y", pady=10)
         self.sales_tree.bind('<Double-1>', self.open_sales_to_delete)
         
     def setup_offers_tab(self):
@@ -507,14 +662,6 @@ class DashboardWindow(ctk.CTk):
         tree_container = ctk.CTkFrame(right_frame, fg_color=self.colors['primary'])
         tree_container.pack(fill="both", expand=True, padx=10, pady=10)
         
-        columns = ('ID', 'Client', 'Date', 'Total')
-        self.saved_offers_tree = ttk.Treeview(
-            tree_container,
-            columns=columns,
-            show='headings',
-            style="Custom.Treeview"
-        )
-        
         saved_offers_column_configs = {
             'ID': (60, 'center'),
             'Client': (150, 'w'),
@@ -522,15 +669,15 @@ class DashboardWindow(ctk.CTk):
             'Total': (80, 'e')
         }
         
-        for col, (width, anchor) in saved_offers_column_configs.items():
-            self.saved_offers_tree.heading(col, text=col)
-            self.saved_offers_tree.column(col, width=width, anchor=anchor)
-        
-        saved_offers_v_scroll = ttk.Scrollbar(tree_container, orient="vertical", command=self.saved_offers_tree.yview)
-        self.saved_offers_tree.configure(yscrollcommand=saved_offers_v_scroll.set)
+        self.saved_offers_tree = VirtualTable(
+            tree_container,
+            saved_offers_column_configs,
+            style="Custom.Treeview",
+            on_near_end=self.load_more_offers
+        )
         
-        self.saved_offers_tree.pack(side="left", fill="both", expand=True)
-        saved_offers_v_scroll.pack(side="right", fill="y")
+        self.saved_offers_tree.tree.pack(side="left", fill="both", expand=True)
+        self.saved_offers_tree.scrollbar.pack(side="right", fill="y")
         
         self.saved_offers_tree.bind('<Double-1>', self.open_offer_details)
         
@@ -763,30 +910,125 @@ class DashboardWindow(ctk.CTk):
             hover_color=self.colors['text_secondary']
         )
         clear_btn.pack(pady=5)
+        
+        export_offers_btn = ctk.CTkButton(
+            buttons_container,
+            text="Export Listed Offers PDF",
+            command=self.export_listed_offers,
+            width=360,
+            height=35,
+            fg_color=self.colors['accent'],
+            text_color=self.colors['primary'],
+            hover_color=self.colors['text_secondary']
+        )
+        export_offers_btn.pack(pady=5)
 
 
     #
     
+    def get_date_range(self):
+        """Half-open [start, end) of the period shown in the sales list"""
+        day = self.selected_date
+        if self.date_filter_mode == "week":
+            start = day - timedelta(days=day.weekday())
+            return start, start + timedelta(days=7)
+        if self.date_filter_mode == "month":
+            return month_range(day.year, day.month)
+        if self.date_filter_mode == "year":
+            return date(day.year, 1, 1), date(day.year + 1, 1, 1)
+        if self.date_filter_mode == "custom":
+            return self.start_date, self.end_date + timedelta(days=1)
+        return day, day + timedelta(days=1)
+
     def get_date_display_text(self):
+        start, end = self.get_date_range()
+        last = end - timedelta(days=1)
+        if self.date_filter_mode == "week":
+            return f"{start.strftime('%d %b')} - {last.strftime('%d %b %Y')}"
+        if self.date_filter_mode == "month":
+            return start.strftime('%B %Y')
+        if self.date_filter_mode == "year":
+            return start.strftime('%Y')
+        if self.date_filter_mode == "custom":
+            return f"{start.strftime('%d.%m.%Y')} - {last.strftime('%d.%m.%Y')}"
         return self.selected_date.strftime('%A, %B %d, %Y')
-    
-    def navigate_previous(self):
-        self.selected_date = self.selected_date - timedelta(days=1)
+
+    def shift_period(self, step):
+        day = self.selected_date
+        if self.date_filter_mode == "week":
+            self.selected_date = day + timedelta(days=7 * step)
+        elif self.date_filter_mode == "month":
+            month_index = day.month - 1 + step
+            year, month = day.year + month_index // 12, month_index % 12 + 1
+            self.selected_date = date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+        elif self.date_filter_mode == "year":
+            year = day.year + step
+            self.selected_date = date(year, day.month, min(day.day, calendar.monthrange(year, day.month)[1]))
+        elif self.date_filter_mode == "custom":
+            length = (self.end_date - self.start_date).days + 1
+            self.start_date += timedelta(days=length * step)
+            self.end_date += timedelta(days=length * step)
+            self.fill_custom_range_inputs()
+        else:
+            self.selected_date = day + timedelta(days=step)
         self.update_date_display()
-        self.update_manual_date_inputs()  
+        self.update_manual_date_inputs()
         self.refresh_sales_list()
+
+    def navigate_previous(self):
+        self.shift_period(-1)
     
     def navigate_next(self):
-        self.selected_date = self.selected_date + timedelta(days=1)
-        self.update_date_display()
-        self.update_manual_date_inputs()  
-        self.refresh_sales_list()
+        self.shift_period(1)
     
     def select_today(self):
         self.selected_date = date.today()
+        if self.date_filter_mode == "custom":
+            self.set_date_filter_mode(DATE_FILTER_MODES["day"])
+            return
         self.update_date_display()
         self.update_manual_date_inputs()  
         self.refresh_sales_list()
+
+    def set_date_filter_mode(self, label):
+        mode = next(key for key, value in DATE_FILTER_MODES.items() if value == label)
+        if mode == "custom":
+            # Start the custom range from the period currently shown
+            start, end = self.get_date_range()
+            self.start_date, self.end_date = start, end - timedelta(days=1)
+            self.fill_custom_range_inputs()
+            self.custom_range_frame.pack(side="left")
+        else:
+            self.custom_range_frame.pack_forget()
+
+        self.date_filter_mode = mode
+        self.mode_selector.set(label)
+        self.prev_btn.configure(text=f"< Previous {label}")
+        self.next_btn.configure(text=f"Next {label} >")
+        self.update_date_display()
+        self.refresh_sales_list()
+
+    def fill_custom_range_inputs(self):
+        self.range_start_entry.delete(0, 'end')
+        self.range_start_entry.insert(0, self.start_date.isoformat())
+        self.range_end_entry.delete(0, 'end')
+        self.range_end_entry.insert(0, self.end_date.isoformat())
+
+    def apply_custom_range(self):
+        try:
+            start = date.fromisoformat(self.range_start_entry.get().strip())
+            end = date.fromisoformat(self.range_end_entry.get().strip())
+        except ValueError:
+            messagebox.showerror("Error", "Invalid Format, use YYYY-MM-DD")
+            return
+
+        if end < start:
+            messagebox.showerror("Error", "End date is before start date")
+            return
+
+        self.start_date, self.end_date = start, end
+        self.update_date_display()
+        self.refresh_sales_list()
     
     def update_date_display(self):
         self.date_display.configure(text=self.get_date_display_text())
@@ -826,37 +1068,132 @@ class DashboardWindow(ctk.CTk):
         sale_datetime = datetime.combine(sale_date, datetime.now().time())
 
 
-        if self.sales_service.create_sale(doc,amount,self.user,sale_datetime):
-            messagebox.showinfo("Success", "Sale Created")
-            self.doc_entry.delete(0, 'end')
-            self.amount_entry.delete(0, 'end')
-            self.refresh_sales_list()
-        else:
+        self.dispatcher.run(
+            self.background.sales.create_sale(doc, amount, self.user, sale_datetime),
+            self.on_sale_saved
+        )
+
+    def on_sale_saved(self, sale):
+        if not sale:
             messagebox.showerror("Error", "Failed creating sale")
+            return
+        messagebox.showinfo("Success", "Sale Created")
+        self.doc_entry.delete(0, 'end')
+        self.amount_entry.delete(0, 'end')
+
+        if self.search_text:
+            self.refresh_sales_list(keep_view=True)
+            return
+        # Only the new row changes: place it among the loaded rows instead of reloading them
+        start, end = self.get_date_range()
+        key = self.sale_key(sale)
+        in_period = start.isoformat() <= sale.timestamp < end.isoformat()
+        # older than the last loaded row while more pages remain: a later page brings it
+        loaded = self.sales_next_token is None or key > tuple(self.sales_next_token)
+        if in_period and loaded:
+            self.sales_tree.insert_sorted(key, self.sale_values(sale), descending=True)
+        self.refresh_sales_totals()
 
         
 
-    def refresh_sales_list(self):
-        for item in self.sales_tree.get_children():
-            self.sales_tree.delete(item)
+    def refresh_sales_list(self, keep_view=False):
+        """Reload the selected period in the background, superseding a load still running for another one.
+        With keep_view the rows already loaded are fetched again and reconciled by id,
+        so scroll position and selection survive and only changed rows are redrawn."""
+        if self.search_text:
+            self.dispatcher.run(
+                self.background.sales.search_sales(self.user, self.search_text),
+                lambda sales: self.show_sales_search(sales, keep_view),
+                key='sales'
+            )
+            return
 
-        sales = self.sales_service.get_sales_by_date(self.user, self.selected_date)
+        start, end = self.get_date_range()
+        if keep_view:
+            limit = max(SALES_PAGE_SIZE, len(self.sales_tree))
+            self.dispatcher.run(
+                self.background.sales.get_sales_page(self.user, start, end, limit=limit),
+                lambda page: self.show_sales_page(page, reconcile=True),
+                key='sales'
+            )
+        else:
+            self.dispatcher.run(
+                self.background.sales.get_sales_page(self.user, start, end),
+                lambda page: self.show_sales_page(page, reset=True),
+                key='sales'
+            )
+        self.refresh_sales_totals()
 
-        total_amount = 0
+    def show_sales_search(self, sales, keep_view=False):
+        self.show_sales_page((sales, None), reset=not keep_view, reconcile=keep_view)
+        self.refresh_sales_totals()
 
-        for sale in sales:
-            dt = datetime.fromisoformat(sale.timestamp)
-            self.sales_tree.insert('', 'end', values=(
-                sale.id,
-                sale.doc,
-                f"{sale.amount:.2f}",
-                dt.strftime('%Y-%m-%d'),
-                dt.strftime('%H:%M')
-            ))
-            total_amount += sale.amount
-        self.stats_label.configure(text=f"Total: {len(sales)} sales | {total_amount:.2f} RON")
+    def refresh_sales_totals(self):
+        """Period count, total, min, max and days with sales, one rollup query however
+        long the period is"""
+        if self.search_text:
+            matches = len(self.sales_tree)
+            if matches >= SEARCH_LIMIT:
+                # search_sales stops at SEARCH_LIMIT, there may be more
+                self.stats_label.configure(text=f"Search: first {matches} matching sales, refine to see others")
+            else:
+                self.stats_label.configure(text=f"Search: {matches} matching sales")
+            return
+        start, end = self.get_date_range()
+        self.dispatcher.run(
+            self.background.sales.get_range_stats(self.user, start, end),
+            self.show_sales_totals,
+            key='sales_totals'
+        )
+
+    def show_sales_totals(self, stats):
+        if self.search_text:
+            return
+        sales_count, total_amount, min_amount, max_amount, days = stats
+        text = f"Total: {sales_count} sales | {total_amount:.2f} RON"
+        if sales_count and min_amount is not None:
+            text += f" | min {min_amount:.2f} | max {max_amount:.2f} | {days} days"
+        self.stats_label.configure(text=text)
         
 
+    def sale_key(self, sale):
+        """Row key of a sale in sales_tree, the list is sorted by it newest first"""
+        return sale.timestamp, sale.id
+
+    def sale_values(self, sale):
+        dt = datetime.fromisoformat(sale.timestamp)
+        return (
+            sale.id,
+            sale.doc,
+            f"{sale.amount:.2f}",
+            dt.strftime('%Y-%m-%d'),
+            dt.strftime('%H:%M')
+        )
+
+    def show_sales_page(self, page, reset=False, reconcile=False):
+        sales, self.sales_next_token = page
+        rows = [(self.sale_key(sale), self.sale_values(sale)) for sale in sales]
+
+        if reconcile:
+            self.sales_tree.reconcile(rows)
+        elif reset:
+            self.sales_tree.set_rows(rows)
+        else:
+            self.sales_tree.append_rows(rows)
+
+    def load_more_sales(self):
+        if not self.sales_next_token or self.dispatcher.is_pending('sales'):
+            return
+        if not self.sales_tree.is_near_end():
+            return
+
+        start, end = self.get_date_range()
+        self.dispatcher.run(
+            self.background.sales.get_sales_page(self.user, start, end, after=self.sales_next_token),
+            self.show_sales_page,
+            key='sales'
+        )
+
     def add_product_to_offer(self):
         code = self.product_code_entry.get().strip()
         name = self.product_name_entry.get().strip()
@@ -969,53 +1306,119 @@ class DashboardWindow(ctk.CTk):
             
             print("All fields are filled, proceeding to create offer...")
             
-            if self.offer_service.create_offer(cif, name, address, phone, self.current_offer_positions, self.user):
-                messagebox.showinfo("Success", "Offer created successfully")
-                self.clear_offer()
-                self.load_saved_offers()
-            else:
-                messagebox.showerror("Error", "Failed to create offer")
+            self.dispatcher.run(
+                self.background.offers.create_offer(
+                    cif, name, address, phone, list(self.current_offer_positions), self.user
+                ),
+                self.on_offer_saved,
+                on_error=lambda e: messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
             print(f"Exception in save_offer: {e}")
+
+    def on_offer_saved(self, created):
+        if created:
+            messagebox.showinfo("Success", "Offer created successfully")
+            self.clear_offer()
+            self.load_saved_offers(keep_view=True)
+        else:
+            messagebox.showerror("Error", "Failed to create offer")
             
-    def load_saved_offers(self):
-        for item in self.saved_offers_tree.get_children():
-            self.saved_offers_tree.delete(item)
-
-        offers = self.offer_service.get_offers_by_user(self.user)
-        for offer in offers:
-            total = sum(
-                p.quantity * p.unit_price * (1 + p.vat/100)
-                for p in offer.products
+    def load_saved_offers(self, keep_view=False):
+        """Load the first page of offers, or with keep_view reconcile every loaded offer by id"""
+        if self.search_text:
+            self.dispatcher.run(
+                self.background.offers.search_offer_summaries(self.user, self.search_text),
+                lambda summaries: self.show_offers_page((summaries, None), reset=not keep_view, reconcile=keep_view),
+                key='offers'
+            )
+        elif keep_view:
+            limit = max(OFFERS_PAGE_SIZE, len(self.saved_offers_tree))
+            self.dispatcher.run(
+                self.background.offers.get_offer_summaries_page(self.user, limit=limit),
+                lambda page: self.show_offers_page(page, reconcile=True),
+                key='offers'
             )
-            dt = datetime.fromisoformat(offer.timestamp)
-            self.saved_offers_tree.insert('', 'end', values=(
-                offer.id,
-                offer.name if offer.name else offer.cif,
+        else:
+            self.dispatcher.run(
+                self.background.offers.get_offer_summaries_page(self.user),
+                lambda page: self.show_offers_page(page, reset=True),
+                key='offers'
+            )
+
+    def on_search_changed(self, event=None):
+        if self.search_after_id is not None:
+            self.after_cancel(self.search_after_id)
+        self.search_after_id = self.after(SEARCH_DEBOUNCE_MS, self.apply_search)
+
+    def apply_search(self):
+        """Show search results in the sales and offers lists, or the selected period again once cleared"""
+        self.search_after_id = None
+        text = self.search_entry.get().strip()
+        if text == self.search_text:
+            return
+        self.search_text = text
+        self.refresh_sales_list()
+        if OFFERS_TAB in self.built_tabs:
+            self.load_saved_offers()
+
+    def clear_search(self, event=None):
+        self.search_entry.delete(0, 'end')
+        self.on_search_changed()
+
+    def show_offers_page(self, page, reset=False, reconcile=False):
+        summaries, self.offers_next_token = page
+        rows = []
+        for summary in summaries:
+            dt = datetime.fromisoformat(summary.timestamp)
+            rows.append((summary.id, (
+                summary.id,
+                summary.client,
                 dt.strftime('%Y-%m-%d'),
-                f"{total:.2f}"
-            ))
+                f"{summary.total:.2f}"
+            )))
+
+        if reconcile:
+            self.saved_offers_tree.reconcile(rows)
+        elif reset:
+            self.saved_offers_tree.set_rows(rows)
+        else:
+            self.saved_offers_tree.append_rows(rows)
+    
+    def load_more_offers(self):
+        if not self.offers_next_token or self.dispatcher.is_pending('offers'):
+            return
+        if not self.saved_offers_tree.is_near_end():
+            return
+
+        self.dispatcher.run(
+            self.background.offers.get_offer_summaries_page(self.user, after=self.offers_next_token),
+            self.show_offers_page,
+            key='offers'
+        )
     
     def open_offer_details(self, event):
-        selection = self.saved_offers_tree.selection()
-        if not selection :
+        values = self.saved_offers_tree.selected_values()
+        if not values:
             messagebox.showerror("Error", "No selected offer")
             return
 
-        item = self.saved_offers_tree.item(selection[0])
-        offer_id = item['values'][0]
+        offer_id = values[0]
 
-        offers = self.offer_service.get_offers_by_user(self.user)
-        offer_data = None
-        for o in offers:
-            if o.id == offer_id:
-                offer_data = o
-                break
-    
+        self.dispatcher.run(
+            self.background.offers.get_offer_by_id(offer_id),
+            self.show_offer_details,
+            key='open_offer'
+        )
+
+    def show_offer_details(self, offer_data):
         if offer_data:
+            from ui.offer_window import OfferDetailWindow
             detail_window = OfferDetailWindow(self, offer_data, self.offer_service)
+        else:
+            messagebox.showerror("Error", "Offer no longer exists")
 
     
     def clear_offer(self):
@@ -1052,248 +1455,252 @@ class DashboardWindow(ctk.CTk):
 
 
     def open_sales_to_delete(self,event):
-        selection = self.sales_tree.selection()
-        if not selection:
+        values = self.sales_tree.selected_values()
+        if not values:
             messagebox.showerror("Error", "Select sale")
             return
 
         if not messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this sale?"):
             return
 
-        try:
-            item = self.sales_tree.item(selection[0])
-            id = item["values"][0]
-            if not self.sales_service.delete_sale(id):
-                messagebox.showerror("Error", "Could not delete sale")
-                return
-            else:
-                self.refresh_sales_list()
-                messagebox.showinfo("Success", "Sale deleted")
+        id = values[0]
+        key = self.sales_tree.selected_key
+        self.dispatcher.run(
+            self.background.sales.delete_sale(id),
+            lambda deleted: self.on_sale_deleted(key, deleted),
+            on_error=lambda e: messagebox.showerror("Error", f"Could not delete sale: {e}")
+        )
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not delete sale: {e}")
+    def on_sale_deleted(self, key, deleted):
+        if not deleted:
+            messagebox.showerror("Error", "Could not delete sale")
+            return
+        self.sales_tree.remove_row(key)
+        self.refresh_sales_totals()
+        messagebox.showinfo("Success", "Sale deleted")
+
+    def import_sales_csv(self):
+        """Import sales from a till export CSV with doc, amount and timestamp columns"""
+        file_path = filedialog.askopenfilename(
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            title="Import Sales CSV"
+        )
+        if not file_path:
+            return
+        if self.import_progress is not None:
+            messagebox.showinfo("Import", "An import is already running")
+            return
+
+        # Runs on the db worker, so saves and refreshes queued meanwhile wait for it
+        self.import_progress = 0
+        self.dispatcher.run(
+            self.background.submit(
+                SalesImportService(self.sales_service).import_csv,
+                file_path, self.user, self.on_import_progress
+            ),
+            self.on_sales_imported,
+            on_error=self.on_import_failed
+        )
+        self.show_import_progress()
+
+    def on_import_progress(self, imported):
+        """Called on the db worker after every saved batch, only stores the count"""
+        self.import_progress = imported
+
+    def show_import_progress(self):
+        if self.import_progress is None:
+            return
+        self.stats_label.configure(text=f"Importing sales: {self.import_progress} saved")
+        self.after(IMPORT_PROGRESS_MS, self.show_import_progress)
+
+    def on_import_failed(self, error):
+        self.import_progress = None
+        self.refresh_sales_list(keep_view=True)
+        messagebox.showerror("Import", f"Import failed: {error}")
+
+    def on_sales_imported(self, result):
+        self.import_progress = None
+        self.refresh_sales_list(keep_view=True)
+
+        if result.failure:
+            messagebox.showerror(
+                "Import",
+                f"Import stopped after {result.imported} sales, the rest of the file was not imported:\n{result.failure}"
+            )
+            return
+
+        message = f"Imported {result.imported} sales."
+        if result.bad_lines:
+            details = "\n".join(f"Line {line_no}: {error}" for line_no, error in result.errors[:10])
+            message += f"\n{result.bad_lines} lines skipped:\n{details}"
+            if result.bad_lines > 10:
+                message += "\n..."
+            messagebox.showwarning("Import", message)
+        else:
+            messagebox.showinfo("Import", message)
 
     def export_day_pdf(self):
         """Export sales for selected day to PDF"""
-        try:
-            sales = self.sales_service.get_sales_by_date(self.user, self.selected_date)
-            
-            if not sales:
-                messagebox.showinfo("Info", "No sales data to export for selected date")
-                return
-            
-            # Open file save dialog
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".pdf",
-                filetypes=[("PDF files", "*.pdf")],
-                title="Save Daily Sales Report",
-                initialfile=f"daily_sales_{self.selected_date.strftime('%Y-%m-%d')}.pdf"
-            )
-            
-            if not file_path:
+        day = self.selected_date
+        self.when_exportable(
+            self.background.sales.get_totals_by_date(self.user, day),
+            "No sales data to export for selected date",
+            lambda: self.save_day_pdf(day)
+        )
+
+    def when_exportable(self, totals_future, empty_message, then):
+        """Call then() on the Tk thread once the (count, total) from the db worker shows
+        there are sales to export, otherwise tell the user there is nothing"""
+        def check(totals):
+            sales_count, _ = totals
+            if not sales_count:
+                messagebox.showinfo("Info", empty_message)
                 return
-            
-            doc = SimpleDocTemplate(file_path, pagesize=A4, topMargin=2*cm, bottomMargin=2*cm)
-            styles = getSampleStyleSheet()
-            story = []
-            
-            # Title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=18,
-                alignment=TA_CENTER,
-                spaceAfter=20
-            )
-            story.append(Paragraph(f"Daily Sales Report", title_style))
-            
-            # Header info
-            header_style = ParagraphStyle(
-                'HeaderStyle',
-                parent=styles['Normal'],
-                fontSize=12,
-                alignment=TA_LEFT,
-                spaceAfter=10
-            )
-            
-            story.append(Paragraph(f"<b>User:</b> {self.user.username}", header_style))
-            story.append(Paragraph(f"<b>Date:</b> {self.selected_date.strftime('%A, %B %d, %Y')}", header_style))
-            story.append(Paragraph(f"<b>Total Sales:</b> {len(sales)}", header_style))
-            
-            total_amount = sum(sale.amount for sale in sales)
-            story.append(Paragraph(f"<b>Total Amount:</b> {total_amount:.2f} RON", header_style))
-            story.append(Spacer(1, 20))
-            
-            # Sales table
-            data = [['Nr.', 'Document', 'Amount (RON)', 'Time']]
-            
-            for idx, sale in enumerate(sales, 1):
-                dt = datetime.fromisoformat(sale.timestamp)
-                data.append([
-                    str(idx),
-                    sale.doc,
-                    f"{sale.amount:.2f}",
-                    dt.strftime('%H:%M:%S')
-                ])
-            
-            table = Table(data, colWidths=[1*cm, 8*cm, 3*cm, 3*cm])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('ALIGN', (1, 1), (1, -1), 'LEFT'),  # Document column left aligned
-                ('ALIGN', (2, 1), (2, -1), 'RIGHT'),  # Amount column right aligned
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            story.append(table)
-            story.append(Spacer(1, 20))
-            
-            # Summary
-            summary_style = ParagraphStyle(
-                'SummaryStyle',
-                parent=styles['Normal'],
-                fontSize=12,
-                alignment=TA_CENTER,
-                spaceAfter=10
-            )
-            story.append(Paragraph(f"<b>TOTAL: {total_amount:.2f} RON</b>", summary_style))
-            story.append(Paragraph(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
-            
-            doc.build(story)
-            messagebox.showinfo("Success", f"Daily sales report exported to:\n{file_path}")
-            
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export daily sales:\n{str(e)}")
+            then()
+
+        self.dispatcher.run(totals_future, check)
+
+    def save_day_pdf(self, day):
+        # Open file save dialog
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf")],
+            title="Save Daily Sales Report",
+            initialfile=f"daily_sales_{day.strftime('%Y-%m-%d')}.pdf"
+        )
+
+        if not file_path:
+            return
+
+        job = self.exports.submit(
+            f"Daily report {day.strftime('%Y-%m-%d')}",
+            file_path,
+            lambda job: self.get_report_service().build_day_report(job, file_path, self.user, day)
+        )
+        self.export_panel.track(job)
+
+
+    def get_report_service(self):
+        """ReportService created on first use, so ReportLab is imported by the export worker
+        instead of at startup"""
+        with self.lazy_services_lock:
+            if self.report_service is None:
+                from services.report_service import ReportService
+                self.report_service = ReportService(self.sales_service)
+            return self.report_service
+
+    def get_offer_document_service(self):
+        """Offer document renderer shared by every offer window, created on first use like
+        the ReportService. Rendered PDFs are cached next to the database."""
+        with self.lazy_services_lock:
+            if self.offer_document_service is None:
+                from services.offer_document_service import OfferDocumentService
+                from services.cached_offer_document_service import CachedOfferDocumentService
+                cache_dir = os.path.join(os.path.dirname(self.sales_service.db.db_file), 'pdf_cache')
+                self.offer_document_service = CachedOfferDocumentService(OfferDocumentService(), cache_dir)
+            return self.offer_document_service
+
+    def export_period_pdf(self):
+        """Export the selected period (a week, a whole year or a custom range) as one report,
+        streamed month by month"""
+        start, end = self.get_date_range()
+        period_text = self.get_date_display_text()
+        self.when_exportable(
+            self.background.sales.get_totals_between(self.user, start, end),
+            "No sales data to export for selected period",
+            lambda: self.save_period_pdf(start, end, period_text)
+        )
+
+    def save_period_pdf(self, start, end, period_text):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf")],
+            title="Save Sales Report",
+            initialfile=f"sales_{start.isoformat()}_{(end - timedelta(days=1)).isoformat()}.pdf"
+        )
 
+        if not file_path:
+            return
+
+        job = self.exports.submit(
+            f"Sales report {period_text}",
+            file_path,
+            lambda job: self.get_report_service().build_range_report(job, file_path, self.user, start, end, period_text)
+        )
+        self.export_panel.track(job)
+
+    def get_batch_export_service(self):
+        """BatchExportService created on first use by the export worker, like the ReportService"""
+        with self.lazy_services_lock:
+            if self.batch_export_service is None:
+                from services.batch_export_service import BatchExportService
+                self.batch_export_service = BatchExportService(self.sales_service, self.offer_service)
+            return self.batch_export_service
+
+    def export_period_day_pdfs(self):
+        """One daily report PDF per day with sales in the selected period, rendered in parallel"""
+        start, end = self.get_date_range()
+        period_text = self.get_date_display_text()
+        self.when_exportable(
+            self.background.sales.get_totals_between(self.user, start, end),
+            "No sales data to export for selected period",
+            lambda: self.save_period_day_pdfs(start, end, period_text)
+        )
+
+    def save_period_day_pdfs(self, start, end, period_text):
+        directory = filedialog.askdirectory(title="Folder for Daily Sales Reports")
+        if not directory:
+            return
+
+        job = self.exports.submit(
+            f"Daily reports {period_text}",
+            directory,
+            lambda job: self.get_batch_export_service().export_days(job, directory, self.user, start, end)
+        )
+        self.export_panel.track(job)
+
+    def export_listed_offers(self):
+        """One PDF per offer in the saved offers list (as filtered by the search), rendered in parallel"""
+        offer_ids = self.saved_offers_tree.keys()
+        if not offer_ids:
+            messagebox.showinfo("Info", "No offers to export")
+            return
+
+        directory = filedialog.askdirectory(title="Folder for Offer Documents")
+        if not directory:
+            return
+
+        job = self.exports.submit(
+            f"{len(offer_ids)} offers",
+            directory,
+            lambda job: self.get_batch_export_service().export_offers(job, directory, offer_ids)
+        )
+        self.export_panel.track(job)
 
     def export_month_pdf(self):
         """Export sales for selected month to PDF"""
-        try:
-            # Get first and last day of the month
-            first_day = self.selected_date.replace(day=1)
-            if self.selected_date.month == 12:
-                last_day = self.selected_date.replace(year=self.selected_date.year + 1, month=1, day=1) - timedelta(days=1)
-            else:
-                last_day = self.selected_date.replace(month=self.selected_date.month + 1, day=1) - timedelta(days=1)
-            
-            # Get all sales for the month
-            all_month_sales = []
-            current_date = first_day
-            
-            while current_date <= last_day:
-                daily_sales = self.sales_service.get_sales_by_date(self.user, current_date)
-                if daily_sales:
-                    all_month_sales.append((current_date, daily_sales))
-                current_date += timedelta(days=1)
-            
-            if not all_month_sales:
-                messagebox.showinfo("Info", "No sales data to export for selected month")
-                return
-            
-            # Open file save dialog
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".pdf",
-                filetypes=[("PDF files", "*.pdf")],
-                title="Save Monthly Sales Report",
-                initialfile=f"monthly_sales_{self.selected_date.strftime('%Y-%m')}.pdf"
-            )
-            
-            if not file_path:
-                return
-            
-            doc = SimpleDocTemplate(file_path, pagesize=A4, topMargin=2*cm, bottomMargin=2*cm)
-            styles = getSampleStyleSheet()
-            story = []
-            
-            # Title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=18,
-                alignment=TA_CENTER,
-                spaceAfter=20
-            )
-            story.append(Paragraph(f"Monthly Sales Report", title_style))
-            
-            # Header info
-            header_style = ParagraphStyle(
-                'HeaderStyle',
-                parent=styles['Normal'],
-                fontSize=12,
-                alignment=TA_LEFT,
-                spaceAfter=10
-            )
-            
-            story.append(Paragraph(f"<b>User:</b> {self.user.username}", header_style))
-            story.append(Paragraph(f"<b>Month:</b> {self.selected_date.strftime('%B %Y')}", header_style))
-            
-            total_days_with_sales = len(all_month_sales)
-            total_sales_count = sum(len(daily_sales) for _, daily_sales in all_month_sales)
-            total_month_amount = sum(sale.amount for _, daily_sales in all_month_sales for sale in daily_sales)
-            
-            story.append(Paragraph(f"<b>Days with Sales:</b> {total_days_with_sales}", header_style))
-            story.append(Paragraph(f"<b>Total Sales:</b> {total_sales_count}", header_style))
-            story.append(Paragraph(f"<b>Total Amount:</b> {total_month_amount:.2f} RON", header_style))
-            story.append(Spacer(1, 20))
-            
-            # Daily breakdown
-            day_style = ParagraphStyle(
-                'DayStyle',
-                parent=styles['Heading2'],
-                fontSize=14,
-                alignment=TA_LEFT,
-                spaceAfter=10,
-                spaceBefore=15
-            )
-            
-            normal_style = ParagraphStyle(
-                'NormalStyle',
-                parent=styles['Normal'],
-                fontSize=10,
-                alignment=TA_LEFT,
-                spaceAfter=5
-            )
-            
-            for date, daily_sales in all_month_sales:
-                # Day header
-                daily_total = sum(sale.amount for sale in daily_sales)
-                story.append(Paragraph(
-                    f"{date.strftime('%A, %B %d, %Y')} - {len(daily_sales)} sales - {daily_total:.2f} RON", 
-                    day_style
-                ))
-                
-                # Sales for that day
-                for idx, sale in enumerate(daily_sales, 1):
-                    dt = datetime.fromisoformat(sale.timestamp)
-                    story.append(Paragraph(
-                        f"&nbsp;&nbsp;&nbsp;&nbsp;{idx}. {sale.doc} - {sale.amount:.2f} RON ({dt.strftime('%H:%M')})", 
-                        normal_style
-                    ))
-                
-                story.append(Spacer(1, 10))
-            
-            # Final summary
-            summary_style = ParagraphStyle(
-                'SummaryStyle',
-                parent=styles['Normal'],
-                fontSize=12,
-                alignment=TA_CENTER,
-                spaceAfter=10,
-                spaceBefore=20
-            )
-            story.append(Paragraph(f"<b>MONTHLY TOTAL: {total_month_amount:.2f} RON</b>", summary_style))
-            story.append(Paragraph(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
-            
-            doc.build(story)
-            messagebox.showinfo("Success", f"Monthly sales report exported to:\n{file_path}")
-            
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export monthly sales:\n{str(e)}")
+        year, month = self.selected_date.year, self.selected_date.month
+        self.when_exportable(
+            self.background.sales.get_totals_by_month(self.user, year, month),
+            "No sales data to export for selected month",
+            lambda: self.save_month_pdf(year, month)
+        )
 
+    def save_month_pdf(self, year, month):
+        # Open file save dialog
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf")],
+            title="Save Monthly Sales Report",
+            initialfile=f"monthly_sales_{year:04d}-{month:02d}.pdf"
+        )
+
+        if not file_path:
+            return
 
+        job = self.exports.submit(
+            f"Monthly report {year:04d}-{month:02d}",
+            file_path,
+            lambda job: self.get_report_service().build_month_report(job, file_path, self.user, year, month)
+        )
+        self.export_panel.track(job)
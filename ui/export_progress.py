@@ -0,0 +1,99 @@
+import customtkinter as ctk
+from tkinter import messagebox
+
+POLL_MS = 200
+FINISHED_ROW_MS = 5000
+
+
+class ExportProgressPanel(ctk.CTkFrame):
+    """Strip listing queued and running exports with a progress bar and a Cancel button each.
+
+    Jobs are polled from the Tk thread with after(), the panel packs itself at the
+    bottom of its parent while there is something to show.
+    """
+
+    def __init__(self, parent, export_service, colors):
+        super().__init__(parent, fg_color=colors['light_gray'])
+        self.export_service = export_service
+        self.colors = colors
+        self.rows = {}
+        self.finished = set()
+        self.poll_id = None
+        self.visible = False
+
+    def track(self, job):
+        row = ctk.CTkFrame(self, fg_color="transparent")
+        row.pack(fill="x", padx=10, pady=3)
+
+        label = ctk.CTkLabel(
+            row,
+            text=f"{job.title}: {job.message}",
+            font=("Arial", 11),
+            text_color=self.colors['text_primary'],
+            anchor="w"
+        )
+        label.pack(side="left", fill="x", expand=True)
+
+        cancel_btn = ctk.CTkButton(
+            row,
+            text="Cancel",
+            command=job.cancel,
+            width=70,
+            height=24,
+            fg_color=self.colors['text_secondary'],
+            hover_color=self.colors['dark_gray']
+        )
+        cancel_btn.pack(side="right", padx=(10, 0))
+
+        bar = ctk.CTkProgressBar(row, width=200, mode="indeterminate")
+        bar.pack(side="right", padx=(10, 0))
+        bar.start()
+
+        self.rows[job] = (row, label, bar, cancel_btn)
+        if not self.visible:
+            self.pack(side="bottom", fill="x", pady=(10, 0))
+            self.visible = True
+        if self.poll_id is None:
+            self.poll_id = self.after(POLL_MS, self.poll)
+
+    def poll(self):
+        self.poll_id = None
+        for job, (row, label, bar, cancel_btn) in list(self.rows.items()):
+            label.configure(text=f"{job.title}: {job.message}")
+            if job.total and bar.cget("mode") == "indeterminate":
+                bar.stop()
+                bar.configure(mode="determinate")
+            if job.total:
+                bar.set(job.done / job.total)
+
+            if job.finished and job not in self.finished:
+                self.finish(job)
+
+        if any(not job.finished for job in self.rows):
+            self.poll_id = self.after(POLL_MS, self.poll)
+
+    def finish(self, job):
+        self.finished.add(job)
+        row, label, bar, cancel_btn = self.rows[job]
+        cancel_btn.pack_forget()
+        bar.stop()
+        bar.configure(mode="determinate")
+        bar.set(1 if job.status == 'done' else 0)
+        if job.status == 'failed':
+            messagebox.showerror("Export Error", f"{job.title} failed:\n{job.error}")
+        self.after(FINISHED_ROW_MS, lambda: self.remove(job))
+
+    def remove(self, job):
+        row = self.rows.pop(job)[0]
+        self.finished.discard(job)
+        row.destroy()
+        self.export_service.forget(job)
+        if not self.rows and self.visible:
+            self.pack_forget()
+            self.visible = False
+
+    def destroy(self):
+        if self.poll_id is not None:
+            self.after_cancel(self.poll_id)
+            self.poll_id = None
+        super().destroy()
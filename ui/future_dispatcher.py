@@ -0,0 +1,77 @@
+from tkinter import messagebox
+
+POLL_MS = 20
+
+
+class FutureDispatcher:
+    """Delivers results of background futures to callbacks on the Tk main thread.
+
+    Tk widgets must only be touched from the main thread, so finished futures are
+    picked up by polling with after() instead of done-callbacks. Requests sharing a
+    key supersede each other: submitting a new one cancels the previous future and
+    a result that arrives for an older request is dropped.
+    """
+
+    def __init__(self, widget, poll_ms=POLL_MS):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self.pending = []
+        self.latest = {}
+        self.poll_id = None
+
+    def run(self, future, on_done, key=None, on_error=None):
+        if key is not None:
+            previous = self.latest.get(key)
+            if previous is not None:
+                previous.cancel()
+            self.latest[key] = future
+
+        self.pending.append((future, on_done, on_error, key))
+        if self.poll_id is None:
+            self.poll_id = self.widget.after(self.poll_ms, self.poll)
+        return future
+
+    def is_pending(self, key):
+        return key in self.latest
+
+    def poll(self):
+        self.poll_id = None
+        waiting = []
+        pending, self.pending = self.pending, []
+        for item in pending:
+            future, on_done, on_error, key = item
+            if not future.done():
+                waiting.append(item)
+                continue
+            if key is not None:
+                if self.latest.get(key) is not future:
+                    continue
+                del self.latest[key]
+            if future.cancelled():
+                continue
+
+            try:
+                error = future.exception()
+                if error is None:
+                    on_done(future.result())
+                elif on_error:
+                    on_error(error)
+                else:
+                    raise error
+            except Exception as e:
+                print(f"Error {e}")
+                messagebox.showerror("Error", str(e))
+
+        # callbacks may have queued new requests meanwhile
+        self.pending = waiting + self.pending
+        if self.pending and self.poll_id is None:
+            self.poll_id = self.widget.after(self.poll_ms, self.poll)
+
+    def cancel_all(self):
+        for future, _, _, _ in self.pending:
+            future.cancel()
+        self.pending = []
+        self.latest = {}
+        if self.poll_id is not None:
+            self.widget.after_cancel(self.poll_id)
+            self.poll_id = None
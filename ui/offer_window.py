@@ -1,15 +1,10 @@
 import customtkinter as ctk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
 import os
 import random
 from utils.resource_path import resource_path
+from ui.virtual_table import VirtualTable
 
 class OfferDetailWindow(ctk.CTkToplevel):
     def __init__(self, parent, offer, offer_service):
@@ -24,17 +19,6 @@ class OfferDetailWindow(ctk.CTkToplevel):
         
         self.colors = parent.colors
         
-        self.company_data = {
-            'name': 'SC AUTO & AGRO MAGMANN SRL',
-            'registration_number': 'Nr.ord.reg.com.: 02/52/21/2014',
-            'cif': 'RO-33249865',
-            'address': 'ARAD Str. CALE A RADNEI Nr.237 Judet ARAD',
-            'account': 'RO36BTRLRONCRT0257372202',
-            'bank': 'TRANSILVANIA RON / BRD',
-            'phone': '0720961818-ARAD; 0790687201-INEU',
-            'capital': '200'
-        }
-        
         self.create_widgets()
         self.load_offer_data()
         
@@ -84,13 +68,6 @@ class OfferDetailWindow(ctk.CTkToplevel):
         tree_frame = ctk.CTkFrame(left_frame, fg_color=self.colors['primary'])
         tree_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
         
-        columns = ('ID', 'Code', 'Name', 'Qty', 'Unit Price', 'VAT%', 'Total')
-        self.products_tree = ttk.Treeview(
-            tree_frame,
-            columns=columns,
-            show='headings'
-        )
-        
         column_configs = {
             'ID': (50, 'center'),
             'Code': (100, 'w'),
@@ -101,15 +78,10 @@ class OfferDetailWindow(ctk.CTkToplevel):
             'Total': (120, 'e')
         }
         
-        for col, (width, anchor) in column_configs.items():
-            self.products_tree.heading(col, text=col)
-            self.products_tree.column(col, width=width, anchor=anchor)
+        self.products_tree = VirtualTable(tree_frame, column_configs)
         
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.products_tree.yview)
-        self.products_tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.products_tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
-        scrollbar.pack(side="right", fill="y", pady=10)
+        self.products_tree.tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+        self.products_tree.scrollbar.pack(side="right", fill="y", pady=10)
         
         right_frame = ctk.CTkFrame(main_frame, width=400)
         right_frame.pack(side="right", fill="y")
@@ -269,22 +241,22 @@ class OfferDetailWindow(ctk.CTkToplevel):
         self.total_label.pack(pady=20)
 
     def load_offer_data(self):
-        for item in self.products_tree.get_children():
-            self.products_tree.delete(item)
+        rows = []
+        for prod in self.offer.products or []:
+            price_total = self.calculate_offer_price(prod.quantity,prod.unit_price,prod.vat)
+
+            rows.append((prod.id, (
+                prod.id,
+                prod.product_code,
+                prod.product_name,
+                prod.quantity,
+                f"{prod.unit_price:.2f}",
+                f"{prod.vat:.1f}",
+                f"{price_total:.2f}"
+            )))
+        self.products_tree.set_rows(rows)
 
         if self.offer.products:
-            for prod in self.offer.products:
-                price_total = self.calculate_offer_price(prod.quantity,prod.unit_price,prod.vat)
-
-                self.products_tree.insert('', 'end', values=(
-                    prod.id,                          
-                    prod.product_code,                
-                    prod.product_name,               
-                    prod.quantity,                    
-                    f"{prod.unit_price:.2f}",        
-                    f"{prod.vat:.1f}",               
-                    f"{price_total:.2f}"                
-                ))
             total = self.calculate_total_price()
             self.total_label.configure(text=f"Total: {total['final_total']:.2f} RON")
 
@@ -314,24 +286,33 @@ class OfferDetailWindow(ctk.CTkToplevel):
         }
 
 
+    def run_in_background(self, method, *args, on_done, error_message):
+        """Call an offer service method on the dashboard's db worker and hand the result to
+        on_done on the Tk thread. Results arriving after the window was closed are dropped."""
+        def deliver(result):
+            if self.winfo_exists():
+                on_done(result)
+
+        self.parent_window.dispatcher.run(
+            getattr(self.parent_window.background.offers, method)(*args),
+            deliver,
+            on_error=lambda e: messagebox.showerror("Error", error_message)
+        )
+
     def reload_offer(self):
-        try:
-            offers = self.offer_service.get_offers_by_user_by_id(self.offer.user_id)
-
-            new_offer = None
-
-            for o in offers :
-                if self.offer.id == o.id:
-                    new_offer = o
-                    break
-            if new_offer:
-                self.offer = new_offer
-                self.load_offer_data()
-            else:
-                messagebox.showerror("Error", "Offer no longer exists")
-                self.destroy() 
-        except Exception as e:
-            messagebox.showerror("Error", "Failed to reload")
+        self.run_in_background(
+            'get_offer_by_id', self.offer.id,
+            on_done=self.on_offer_reloaded,
+            error_message="Failed to reload"
+        )
+
+    def on_offer_reloaded(self, new_offer):
+        if new_offer:
+            self.offer = new_offer
+            self.load_offer_data()
+        else:
+            messagebox.showerror("Error", "Offer no longer exists")
+            self.destroy() 
 
     def  add_product(self):
         is_valid  = self.validate_form()
@@ -347,20 +328,20 @@ class OfferDetailWindow(ctk.CTkToplevel):
         vat = float(self.product_vat_entry.get().strip())
 
 
-        try:
-            success = self.offer_service.add_product(self.offer.id,code, name, quantity,unit_price,vat)
+        self.run_in_background(
+            'add_product', self.offer.id, code, name, quantity, unit_price, vat,
+            on_done=self.on_product_added,
+            error_message="Failed to add product"
+        )
 
-            if success:
-                
-                messagebox.showinfo("Success", "Product added")
-                self.clear_form()
-                self.reload_offer()
-                self.load_offer_data()
-                self.parent_window.load_saved_offers()
-            else:
-                messagebox.showerror("Error", "Product not added")
-        except Exception as e:
-            messagebox.showerror("Error", "Failed to add product")
+    def on_product_added(self, success):
+        if success:
+            messagebox.showinfo("Success", "Product added")
+            self.clear_form()
+            self.reload_offer()
+            self.parent_window.load_saved_offers(keep_view=True)
+        else:
+            messagebox.showerror("Error", "Product not added")
 
 
     def validate_form(self):
@@ -399,9 +380,9 @@ class OfferDetailWindow(ctk.CTkToplevel):
         return True
     
     def update_selected_product(self):
-        selection = self.products_tree.selection()
+        values = self.products_tree.selected_values()
 
-        if not selection:
+        if not values:
             messagebox.showerror("Error", "Select offer")
             return
 
@@ -411,8 +392,7 @@ class OfferDetailWindow(ctk.CTkToplevel):
             messagebox.showerror("Error", "Complete all forms")
             return
 
-        item = self.products_tree.item(selection[0])
-        product_id = item['values'][0]
+        product_id = values[0]
 
         code = self.product_code_entry.get().strip()
         name = self.product_name_entry.get().strip()
@@ -420,25 +400,25 @@ class OfferDetailWindow(ctk.CTkToplevel):
         unit_price = float(self.product_unit_price_entry.get().strip())
         vat = float(self.product_vat_entry.get().strip())
 
-        try:
-            success = self.offer_service.update_product(product_id, code, name, quantity, unit_price, vat)
-
-            if success:
+        self.run_in_background(
+            'update_product', product_id, code, name, quantity, unit_price, vat,
+            on_done=self.on_product_updated,
+            error_message="Failed to update product"
+        )
 
-                messagebox.showinfo("Success", "Product updated")
-                self.clear_form()
-                self.reload_offer()
-                self.load_offer_data()
-                self.parent_window.load_saved_offers()
-            else:
-                messagebox.showerror("Error", "Failed to update product")
-        except Exception as e:
+    def on_product_updated(self, success):
+        if success:
+            messagebox.showinfo("Success", "Product updated")
+            self.clear_form()
+            self.reload_offer()
+            self.parent_window.load_saved_offers(keep_view=True)
+        else:
             messagebox.showerror("Error", "Failed to update product")
 
     def delete_selected_product(self):
-        selection = self.products_tree.selection()
+        values = self.products_tree.selected_values()
 
-        if not selection:
+        if not values:
             messagebox.showerror("Error", "Select offer")
             return
 
@@ -446,33 +426,30 @@ class OfferDetailWindow(ctk.CTkToplevel):
             return
 
 
-        item = self.products_tree.item(selection[0])
-        product_id = item['values'][0]
+        product_id = values[0]
 
-        try:
-            success = self.offer_service.delete_product(product_id)
-
-            if success:
-                messagebox.showinfo("Success", "Product deleted")
-                self.reload_offer()
-                self.load_offer_data()
-                self.parent_window.load_saved_offers()
-            else:
-                messagebox.showerror("Error", "Failed to delete product")
-        except Exception as e:
+        self.run_in_background(
+            'delete_product', product_id,
+            on_done=self.on_product_deleted,
+            error_message="Failed to delete product"
+        )
+
+    def on_product_deleted(self, success):
+        if success:
+            messagebox.showinfo("Success", "Product deleted")
+            self.reload_offer()
+            self.parent_window.load_saved_offers(keep_view=True)
+        else:
             messagebox.showerror("Error", "Failed to delete product")
 
 
     def fill_form_from_selection(self):
-        selection = self.products_tree.selection()
+        values = self.products_tree.selected_values()
 
-        if not selection:
+        if not values:
             messagebox.showerror("Error", "Select offer")
             return
 
-        item = self.products_tree.item(selection[0])
-        values = item['values']
-
         self.clear_form()
         self.product_vat_entry.delete(0, "end")
 
@@ -498,374 +475,75 @@ class OfferDetailWindow(ctk.CTkToplevel):
         if not messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this offer?"):
             return
 
-        try:
-            if not self.offer_service.delete_offer(self.offer.id):
-                messagebox.showerror("Error", "Could not delete offer")
-                return
-            else:
-                self.parent_window.load_saved_offers()
-                self.destroy()
-                messagebox.showinfo("Success", "Offer deleted")
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not delete offer: {e}")
-
-
+        self.run_in_background(
+            'delete_offer', self.offer.id,
+            on_done=self.on_offer_deleted,
+            error_message="Could not delete offer"
+        )
 
+    def on_offer_deleted(self, deleted):
+        if not deleted:
+            messagebox.showerror("Error", "Could not delete offer")
+            return
+        self.parent_window.saved_offers_tree.remove_row(self.offer.id)
+        self.destroy()
+        messagebox.showinfo("Success", "Offer deleted")
 
-    from reportlab.lib.pagesizes import A4
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.enums import TA_LEFT, TA_RIGHT
-    from reportlab.lib import colors
-    from reportlab.lib.units import cm
-    from tkinter import filedialog, messagebox
-    from datetime import datetime
 
     def generate_offer_document(self):
         """Generate professional offer document with real offer data"""
-        try:
-            # === Save file dialog ===
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".pdf",
-                filetypes=[("PDF files", "*.pdf")],
-                title="Save Offer Document"
-            )
-            if not file_path:
-                return
-
-            doc = SimpleDocTemplate(file_path, pagesize=A4, topMargin=1*cm, bottomMargin=1*cm)
-            styles = getSampleStyleSheet()
-            normal = styles["Normal"]
-
-            story = []
-
-            # === HEADER STÂNGA (companie) ===
-            header_left = [
-                [Paragraph("<b>SC AUTO & AGRO MAGMANN SRL</b>", normal)],
-                [Paragraph(f"Nr.ord.reg.com.: {self.company_data['registration_number']}", normal)],
-                [Paragraph(f"C.I.F.: {self.company_data['cif']}", normal)],
-                [Paragraph(f"Sediul: {self.company_data['address']}", normal)],
-                [Spacer(1, 3)],
-                [Paragraph(f"Contul: {self.company_data['account']}", normal)],
-                [Paragraph(f"Banca: {self.company_data['bank']}", normal)],
-                [Paragraph("Contul: RO70INGB0000999908841201", normal)],
-                [Paragraph("Banca: ING BANK ARAD", normal)],
-                [Spacer(1, 3)],
-                [Paragraph("<b>Capital social (RON):</b> " + str(self.company_data['capital']), normal)],
-                [Paragraph("<b>Telefon:</b> " + self.company_data['phone'], normal)]
-            ]
-
-            # === HEADER DREAPTA (logo + info) - folosind ID-ul ofertei ===
-            logo_path = resource_path(os.path.join("utils", "logo.png"))
-
-            if os.path.exists(logo_path):
-                logo = Image(logo_path, width=7*cm, height=3.2*cm)
-            else:
-                # Create a placeholder if logo doesn't exist
-                logo = Paragraph("<b>[LOGO]</b>", ParagraphStyle('LogoPlaceholder', fontSize=14, alignment=TA_CENTER))
-            
-            print(f"Logo path: {logo_path}")
-            print(f"Logo exists: {os.path.exists(logo_path)}")
-            print(f"Current directory: {os.getcwd()}")
-            
+        # === Save file dialog ===
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf")],
+            title="Save Offer Document"
+        )
+        if not file_path:
+            return
 
-            header_right = [
-                [logo],
-                [Paragraph("<b>OFERTA DE PRET</b>", normal)],
-                [Paragraph("Seria MAG", normal)],
-                [Paragraph(f"Oferta nr. {self.offer.id}", normal)],  # Folosind ID-ul ofertei
-                [Paragraph(f"Data: {datetime.now().strftime('%d/%m/%Y')}", normal)]
-            ]
-
-            company_table = Table([[header_left, header_right]], colWidths=[10*cm, 7*cm])
-            company_table.setStyle(TableStyle([
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ]))
-            story.append(company_table)
-            story.append(Spacer(1, 12))
-
-            # === CLIENT - folosind datele reale din ofertă ===
-            client_title = Paragraph("<i>Cumparator - Client</i>", ParagraphStyle(
-                'ClientTitle', fontSize=9, textColor=colors.grey, alignment=TA_LEFT
-            ))
-            story.append(client_title)
-
-            client_data = [
-                [f"Nume: {self.offer.name}", "", "", f"C.I.F. {self.offer.cif}"],
-                [f"Adresa: {self.offer.address}", "", "", "Nr.reg.com.:"],
-                [f"Adresa de livrare: IDEM", "", "", f"Telefon: {self.offer.phone}"],
-            ]
-
-            client_table = Table(client_data, colWidths=[9*cm, 2*cm, 2*cm, 5*cm])
-            client_table.setStyle(TableStyle([
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BOX', (0, 0), (-1, -1), 1, colors.black),
-                ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ]))
-            story.append(client_table)
-            story.append(Spacer(1, 15))
-
-            # === PRODUSE ===
-            header_style = ParagraphStyle(
-                'HeaderStyle',
-                fontSize=7,
-                alignment=TA_CENTER,
-                leading=8,
-                wordWrap='CJK'
-            )
-
-            products_header = [[
-                Paragraph('Nr crt.', header_style),
-                Paragraph('Denumirea produselor sau a serviciilor', header_style),
-                Paragraph('U.M.', header_style),
-                Paragraph('Cantitate', header_style),
-                Paragraph('Pret unitar fara TVA RON', header_style),
-                Paragraph('Valoare fara TVA RON', header_style),
-                Paragraph('Cota TVA %', header_style),
-                Paragraph('Valoare T.V.A. RON', header_style)
-            ]]
-
-            totals = self.calculate_total_price()
-
-            if hasattr(self.offer, 'products') and self.offer.products:
-                for idx, product in enumerate(self.offer.products, 1):
-                    value_without_vat = product.quantity * product.unit_price
-                    vat_value = value_without_vat * (product.vat / 100)
-
-                    products_header.append([
-                        str(idx),
-                        f"{product.product_code} - {product.product_name}",
-                        "BUC",
-                        f"{product.quantity:.4f}",
-                        f"{product.unit_price:.4f}",
-                        f"{value_without_vat:.2f}",
-                        str(int(product.vat)),
-                        f"{vat_value:.2f}"
-                    ])
-
-            # Subtotal + TVA
-            products_header.append([
-                "", "", "", "", "", f"{totals['subtotal']:.2f}", "", f"{totals['vat_total']:.2f}"
-            ])
-
-            # Total RON
-            products_header.append([
-                "", "", "", "", "TOTAL RON:", "", "", f"{totals['final_total']:.2f}"
-            ])
-
-            products_table = Table(products_header, colWidths=[1.2*cm, 6*cm, 1.2*cm, 2*cm, 3*cm, 3*cm, 1.5*cm, 2.5*cm])
-            products_table.setStyle(TableStyle([
-                # Header
-                ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.8, 1, 0.8, alpha=0.5)),  # verde pastel
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
-
-                # Linii
-                ('ALIGN', (0, 1), (0, -1), 'CENTER'),
-                ('ALIGN', (2, 1), (7, -1), 'CENTER'),
-                ('ALIGN', (1, 1), (1, -3), 'LEFT'),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-
-                # Totals
-                ('FONTNAME', (0, -2), (-1, -1), 'Helvetica-Bold'),
-                ('BACKGROUND', (0, -2), (-1, -2), colors.whitesmoke),
-                ('BACKGROUND', (0, -1), (-1, -1), colors.whitesmoke),
-
-                # Borders
-                ('BOX', (0, 0), (-1, -1), 1, colors.black),
-                ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ]))
-
-            story.append(products_table)
-
-            # === BUILD PDF ===
-            doc.build(story)
-            messagebox.showinfo("Success", f"Offer document generated successfully at {file_path}")
+        # The worker renders a snapshot, later edits in this window do not race with it
+        offer = self.offer
+        totals = self.calculate_total_price()
+        job = self.parent_window.exports.submit(
+            f"Offer {offer.id}",
+            file_path,
+            lambda job: self.parent_window.get_offer_document_service().render(offer, totals, file_path, job.on_page)
+        )
+        self.parent_window.export_panel.track(job)
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to generate offer document: {str(e)}")
+    def preview_offer_document(self):
+        """Generate the offer document on the export worker, then open it for preview
+        without saving dialog"""
+        offer = self.offer
+        totals = self.calculate_total_price()
+        # Rendered once per offer version, repeated previews reuse the cached file
+        future = self.parent_window.exports.executor.submit(
+            lambda: self.parent_window.get_offer_document_service().preview_path(offer, totals)
+        )
+        self.parent_window.dispatcher.run(
+            future,
+            self.open_preview,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to generate offer preview: {str(e)}")
+        )
 
+    def open_preview(self, file_path):
+        import subprocess
+        import platform
 
-    def preview_offer_document(self):
-        """Generate and open offer document for preview without saving dialog"""
+        # Open the PDF with default system viewer
         try:
-            # Create temporary file path
-            import tempfile
-            import subprocess
-            import platform
-            
-            # Generate temporary PDF file
-            temp_dir = tempfile.gettempdir()
-            temp_filename = f"offer_preview_{self.offer.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            file_path = os.path.join(temp_dir, temp_filename)
-
-            doc = SimpleDocTemplate(file_path, pagesize=A4, topMargin=1*cm, bottomMargin=1*cm)
-            styles = getSampleStyleSheet()
-            normal = styles["Normal"]
-
-            story = []
-
-            # === HEADER STÂNGA (companie) ===
-            header_left = [
-                [Paragraph("<b>SC AUTO & AGRO MAGMANN SRL</b>", normal)],
-                [Paragraph(f"Nr.ord.reg.com.: {self.company_data['registration_number']}", normal)],
-                [Paragraph(f"C.I.F.: {self.company_data['cif']}", normal)],
-                [Paragraph(f"Sediul: {self.company_data['address']}", normal)],
-                [Spacer(1, 3)],
-                [Paragraph(f"Contul: {self.company_data['account']}", normal)],
-                [Paragraph(f"Banca: {self.company_data['bank']}", normal)],
-                [Paragraph("Contul: RO70INGB0000999908841201", normal)],
-                [Paragraph("Banca: ING BANK ARAD", normal)],
-                [Spacer(1, 3)],
-                [Paragraph("<b>Capital social (RON):</b> " + str(self.company_data['capital']), normal)],
-                [Paragraph("<b>Telefon:</b> " + self.company_data['phone'], normal)]
-            ]
-
-            # === HEADER DREAPTA (logo + info) ===
-            logo_path = resource_path(os.path.join("utils", "logo.png"))
-            
-            # Check if logo exists, if not create placeholder
-            if os.path.exists(logo_path):
-                logo = Image(logo_path, width=7*cm, height=3.2*cm)
-            else:
-                # Create a placeholder if logo doesn't exist
-                logo = Paragraph("<b>[LOGO]</b>", ParagraphStyle('LogoPlaceholder', fontSize=14, alignment=TA_CENTER))
-
-            header_right = [
-                [logo],
-                [Paragraph("<b>OFERTA DE PRET</b>", normal)],
-                [Paragraph("Seria MAG", normal)],
-                [Paragraph(f"Oferta nr. {self.offer.id}", normal)],
-                [Paragraph(f"Data: {datetime.now().strftime('%d/%m/%Y')}", normal)]
-            ]
-
-            company_table = Table([[header_left, header_right]], colWidths=[10*cm, 7*cm])
-            company_table.setStyle(TableStyle([
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ]))
-            story.append(company_table)
-            story.append(Spacer(1, 12))
-
-            # === CLIENT ===
-            client_title = Paragraph("<i>Cumparator - Client</i>", ParagraphStyle(
-                'ClientTitle', fontSize=9, textColor=colors.grey, alignment=TA_LEFT
-            ))
-            story.append(client_title)
-
-            client_data = [
-                [f"Nume: {self.offer.name}", "", "", f"C.I.F. {self.offer.cif}"],
-                [f"Adresa: {self.offer.address}", "", "", "Nr.reg.com.:"],
-                [f"Adresa de livrare: IDEM", "", "", f"Telefon: {self.offer.phone}"],
-            ]
-
-            client_table = Table(client_data, colWidths=[9*cm, 2*cm, 2*cm, 5*cm])
-            client_table.setStyle(TableStyle([
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BOX', (0, 0), (-1, -1), 1, colors.black),
-                ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ]))
-            story.append(client_table)
-            story.append(Spacer(1, 15))
-
-            # === PRODUSE ===
-            header_style = ParagraphStyle(
-                'HeaderStyle',
-                fontSize=7,
-                alignment=TA_CENTER,
-                leading=8,
-                wordWrap='CJK'
-            )
-
-            products_header = [[
-                Paragraph('Nr crt.', header_style),
-                Paragraph('Denumirea produselor sau a serviciilor', header_style),
-                Paragraph('U.M.', header_style),
-                Paragraph('Cantitate', header_style),
-                Paragraph('Pret unitar fara TVA RON', header_style),
-                Paragraph('Valoare fara TVA RON', header_style),
-                Paragraph('Cota TVA %', header_style),
-                Paragraph('Valoare T.V.A. RON', header_style)
-            ]]
-
-            totals = self.calculate_total_price()
-
-            if hasattr(self.offer, 'products') and self.offer.products:
-                for idx, product in enumerate(self.offer.products, 1):
-                    value_without_vat = product.quantity * product.unit_price
-                    vat_value = value_without_vat * (product.vat / 100)
-
-                    products_header.append([
-                        str(idx),
-                        f"{product.product_code} - {product.product_name}",
-                        "BUC",
-                        f"{product.quantity:.4f}",
-                        f"{product.unit_price:.4f}",
-                        f"{value_without_vat:.2f}",
-                        str(int(product.vat)),
-                        f"{vat_value:.2f}"
-                    ])
-
-            # Subtotal + TVA
-            products_header.append([
-                "", "", "", "", "", f"{totals['subtotal']:.2f}", "", f"{totals['vat_total']:.2f}"
-            ])
-
-            # Total RON
-            products_header.append([
-                "", "", "", "", "TOTAL RON:", "", "", f"{totals['final_total']:.2f}"
-            ])
-
-            products_table = Table(products_header, colWidths=[1.2*cm, 6*cm, 1.2*cm, 2*cm, 3*cm, 3*cm, 1.5*cm, 2.5*cm])
-            products_table.setStyle(TableStyle([
-                # Header
-                ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.8, 1, 0.8, alpha=0.5)),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
-
-                # Linii
-                ('ALIGN', (0, 1), (0, -1), 'CENTER'),
-                ('ALIGN', (2, 1), (7, -1), 'CENTER'),
-                ('ALIGN', (1, 1), (1, -3), 'LEFT'),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-
-                # Totals
-                ('FONTNAME', (0, -2), (-1, -1), 'Helvetica-Bold'),
-                ('BACKGROUND', (0, -2), (-1, -2), colors.whitesmoke),
-                ('BACKGROUND', (0, -1), (-1, -1), colors.whitesmoke),
-
-                # Borders
-                ('BOX', (0, 0), (-1, -1), 1, colors.black),
-                ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ]))
-
-            story.append(products_table)
-
-            # === BUILD PDF ===
-            doc.build(story)
-            
-            # Open the PDF with default system viewer
-            try:
-                system = platform.system()
-                if system == "Darwin":  # macOS
-                    subprocess.run(["open", file_path])
-                elif system == "Windows":
-                    os.startfile(file_path)
-                else:  # Linux and others
-                    subprocess.run(["xdg-open", file_path])
-                
-                #messagebox.showinfo("Preview", "Offer preview opened in default PDF viewer")
-                
-            except Exception as open_error:
-                messagebox.showwarning("Preview", f"PDF created but couldn't open automatically.\nFile location: {file_path}")
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to generate offer preview: {str(e)}")
+            system = platform.system()
+            if system == "Darwin":  # macOS
+                subprocess.run(["open", file_path])
+            elif system == "Windows":
+                os.startfile(file_path)
+            else:  # Linux and others
+                subprocess.run(["xdg-open", file_path])
+
+            #messagebox.showinfo("Preview", "Offer preview opened in default PDF viewer")
+
+        except Exception as open_error:
+            messagebox.showwarning("Preview", f"PDF created but couldn't open automatically.\nFile location: {file_path}")
                 
 
 
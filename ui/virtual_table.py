@@ -0,0 +1,296 @@
+from tkinter import ttk
+
+BUFFER_ROWS = 5
+WHEEL_ROWS = 3
+
+
+class TableModel:
+    """Rows of a VirtualTable as (key, values) pairs, kept out of Tk.
+
+    values_by_key is kept current on every change. The key -> position index is only
+    rebuilt when a position is looked up after rows were inserted or removed, so a
+    single insert or delete does not re-index the whole table.
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.values_by_key = {}
+        self.index = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def set_rows(self, rows):
+        self.rows = list(rows)
+        self.values_by_key = dict(self.rows)
+        self.reindex()
+
+    def append_rows(self, rows):
+        start = len(self.rows)
+        self.rows.extend(rows)
+        for i in range(start, len(self.rows)):
+            key, values = self.rows[i]
+            self.values_by_key[key] = values
+            if self.index is not None:
+                self.index[key] = i
+
+    def reconcile(self, rows):
+        """Replace the rows with a new result set, returns (inserted, updated, removed) counted by key"""
+        rows = list(rows)
+        new_keys = {key for key, _ in rows}
+        removed = sum(1 for key, _ in self.rows if key not in new_keys)
+        inserted = updated = 0
+        for key, values in rows:
+            old_values = self.values_by_key.get(key)
+            if old_values is None:
+                inserted += 1
+            elif old_values != values:
+                updated += 1
+        self.set_rows(rows)
+        return inserted, updated, removed
+
+    def insert_position(self, key, descending=False):
+        """Index at which key keeps rows that are sorted by key in that order"""
+        lo, hi = 0, len(self.rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key = self.rows[mid][0]
+            if (mid_key > key) if descending else (mid_key < key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def insert(self, i, key, values):
+        self.rows.insert(i, (key, values))
+        self.values_by_key[key] = values
+        self.index = None
+
+    def remove(self, key):
+        values = self.values_by_key.pop(key, None)
+        if values is None:
+            return None
+        if self.index is not None:
+            i = self.index[key]
+        else:
+            i = self.rows.index((key, values))
+        del self.rows[i]
+        self.index = None
+        return i
+
+    def reindex(self):
+        self.index = {key: i for i, (key, _) in enumerate(self.rows)}
+
+    def index_of(self, key):
+        if key not in self.values_by_key:
+            return None
+        if self.index is None:
+            self.reindex()
+        return self.index.get(key)
+
+    def values(self, key):
+        return self.values_by_key.get(key)
+
+
+class VirtualTable:
+    """ttk.Treeview that only materializes the visible window of a large TableModel.
+
+    The tree holds a fixed set of slot items (visible rows plus a small buffer) whose
+    values are rewritten as the user scrolls, so Tk never holds more than a screenful
+    of items. Scrolling is driven by our own scrollbar, mouse wheel and keyboard
+    handlers. Selection is tracked by row key, so it survives scrolling and reloads.
+    The caller packs .tree and .scrollbar like a plain Treeview.
+    """
+
+    def __init__(self, parent, column_configs, style=None, row_height=None, on_near_end=None, buffer_rows=BUFFER_ROWS):
+        self.model = TableModel()
+        self.on_near_end = on_near_end
+        self.buffer_rows = buffer_rows
+        self.offset = 0
+        self.visible_rows = 1
+        self.slots = []
+        self.slot_rows = []
+        self.selected_key = None
+
+        options = {'columns': tuple(column_configs), 'show': 'headings', 'selectmode': 'browse'}
+        if style:
+            options['style'] = style
+        self.tree = ttk.Treeview(parent, **options)
+        for col, (width, anchor) in column_configs.items():
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, anchor=anchor)
+
+        self.row_height = row_height or int(ttk.Style().lookup(style or 'Treeview', 'rowheight') or 20)
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.yview)
+
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<<TreeviewSelect>>', self.on_select)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(-WHEEL_ROWS if e.delta > 0 else WHEEL_ROWS))
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-WHEEL_ROWS))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(WHEEL_ROWS))
+        self.tree.bind('<Up>', lambda e: self.move_selection(-1))
+        self.tree.bind('<Down>', lambda e: self.move_selection(1))
+        self.tree.bind('<Prior>', lambda e: self.move_selection(-self.visible_rows))
+        self.tree.bind('<Next>', lambda e: self.move_selection(self.visible_rows))
+        self.tree.bind('<Home>', lambda e: self.move_selection(-len(self.model)))
+        self.tree.bind('<End>', lambda e: self.move_selection(len(self.model)))
+
+    def bind(self, sequence, handler):
+        return self.tree.bind(sequence, handler, add='+')
+
+    # model
+
+    def set_rows(self, rows):
+        self.model.set_rows(rows)
+        self.offset = 0
+        self.render()
+
+    def append_rows(self, rows):
+        self.model.append_rows(rows)
+        self.render()
+
+    def reconcile(self, rows):
+        """Show a new result set keeping scroll position and selection; Tk items are only
+        touched for rows that changed inside the rendered window"""
+        anchor = self.model.rows[self.offset][0] if self.offset < len(self.model) else None
+        changes = self.model.reconcile(rows)
+        if not any(changes):
+            return changes
+
+        i = self.model.index_of(anchor)
+        self.offset = min(self.offset if i is None else i, self.max_offset())
+        if self.model.index_of(self.selected_key) is None:
+            self.selected_key = None
+        self.render()
+        return changes
+
+    def insert_sorted(self, key, values, descending=False):
+        """Insert one row where it belongs in rows sorted by key, keeping the rows in view
+        in place. Returns its index."""
+        i = self.model.insert_position(key, descending)
+        self.model.insert(i, key, values)
+        if i < self.offset:
+            self.offset += 1
+        self.render()
+        return i
+
+    def remove_row(self, key):
+        i = self.model.remove(key)
+        if i is None:
+            return False
+        if key == self.selected_key:
+            self.selected_key = None
+        if i < self.offset:
+            self.offset -= 1
+        self.offset = min(self.offset, self.max_offset())
+        self.render()
+        return True
+
+    def clear(self):
+        self.set_rows([])
+
+    def __len__(self):
+        return len(self.model)
+
+    def keys(self):
+        return [key for key, _ in self.model.rows]
+
+    def selected_values(self):
+        if self.selected_key is None:
+            return None
+        return self.model.values(self.selected_key)
+
+    # scrolling
+
+    def max_offset(self):
+        return max(0, len(self.model) - self.visible_rows)
+
+    def scroll_to(self, offset):
+        offset = min(max(0, int(offset)), self.max_offset())
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+        return 'break'
+
+    def scroll(self, rows):
+        return self.scroll_to(self.offset + rows)
+
+    def yview(self, *args):
+        if not args:
+            return self.fractions()
+        if args[0] == 'moveto':
+            return self.scroll_to(round(float(args[1]) * len(self.model)))
+        if args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self.visible_rows
+            return self.scroll(step)
+
+    def fractions(self):
+        total = len(self.model)
+        if total == 0:
+            return 0.0, 1.0
+        return self.offset / total, min(1.0, (self.offset + self.visible_rows) / total)
+
+    def is_near_end(self):
+        return self.offset + self.visible_rows >= len(self.model) - self.buffer_rows
+
+    def move_selection(self, step):
+        if not len(self.model):
+            return 'break'
+        current = self.model.index_of(self.selected_key)
+        target = 0 if current is None else min(max(0, current + step), len(self.model) - 1)
+        self.selected_key = self.model.rows[target][0]
+        if target < self.offset:
+            self.offset = target
+        elif target >= self.offset + self.visible_rows:
+            self.offset = target - self.visible_rows + 1
+        self.render()
+        return 'break'
+
+    # rendering
+
+    def on_resize(self, event):
+        first = self.tree.bbox(self.slots[0]) if self.slots else None
+        header = first[1] if first else self.row_height
+        visible = max(1, (event.height - header) // self.row_height)
+        if visible != self.visible_rows:
+            self.visible_rows = visible
+            self.offset = min(self.offset, self.max_offset())
+            self.render()
+
+    def render(self):
+        rows = self.model.rows[self.offset:self.offset + self.visible_rows + self.buffer_rows]
+
+        # recycle slot items: grow or shrink the pool, then rewrite values in place
+        while len(self.slots) < len(rows):
+            self.slots.append(self.tree.insert('', 'end', values=()))
+            self.slot_rows.append(None)
+        while len(self.slots) > len(rows):
+            self.tree.delete(self.slots.pop())
+            self.slot_rows.pop()
+
+        selected_slot = None
+        for n, (slot, row) in enumerate(zip(self.slots, rows)):
+            if self.slot_rows[n] != row:
+                self.tree.item(slot, values=row[1])
+                self.slot_rows[n] = row
+            if row[0] == self.selected_key:
+                selected_slot = slot
+
+        if self.tree.selection() != ((selected_slot,) if selected_slot else ()):
+            self.tree.selection_set((selected_slot,) if selected_slot else ())
+        self.tree.yview_moveto(0)
+        self.scrollbar.set(*self.fractions())
+
+        if self.on_near_end and len(self.model) and self.is_near_end():
+            self.tree.after_idle(self.on_near_end)
+
+    def on_select(self, event):
+        # reads the current selection, so the event raised by render itself is a no-op
+        selection = self.tree.selection()
+        if not selection or selection[0] not in self.slots:
+            return
+        i = self.offset + self.slots.index(selection[0])
+        if i < len(self.model):
+            self.selected_key = self.model.rows[i][0]
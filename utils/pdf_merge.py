@@ -0,0 +1,102 @@
+"""Concatenate PDF files into one, written to disk as it is read.
+
+pypdf's PdfWriter keeps every page of the result in memory until write(), about as
+much as rendering everything in one ReportLab build. merge_pdfs reads the inputs one
+at a time with PdfReader and writes each input's objects straight to the output,
+renumbered, so only one input is parsed at a time. Besides that it keeps just the
+byte offset of every written object and the object number of every page.
+
+Inputs are expected to be plain documents like the ones ReportLab writes: pages and
+the objects they use are copied, outlines, forms and document metadata are not.
+"""
+import gc
+from array import array
+from pypdf import PdfReader
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject
+
+# Page attributes a page may inherit from its parents in the page tree
+INHERITED_PAGE_KEYS = ('/Resources', '/MediaBox', '/CropBox', '/Rotate')
+
+# Object numbers of the merged document's page tree and catalog, written last
+PAGES_NUMBER = 1
+CATALOG_NUMBER = 2
+
+
+def merge_pdfs(paths, output_path):
+    """Write the pages of the PDF files at paths, in order, to output_path. Returns the
+    number of pages written."""
+    # byte offset of every object by object number, and the object numbers of the pages
+    offsets = array('q', [0] * (CATALOG_NUMBER + 1))
+    kids = array('q')
+
+    with open(output_path, 'wb') as out:
+        out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        for path in paths:
+            copy_pages(path, out, offsets, kids)
+            # a reader's objects point back at it, collect it before parsing the next input
+            gc.collect()
+
+        offsets[PAGES_NUMBER] = out.tell()
+        out.write(f"{PAGES_NUMBER} 0 obj\n<< /Type /Pages /Count {len(kids)} /Kids [".encode())
+        out.write(" ".join(f"{kid} 0 R" for kid in kids).encode())
+        out.write(b"] >>\nendobj\n")
+        offsets[CATALOG_NUMBER] = out.tell()
+        out.write(f"{CATALOG_NUMBER} 0 obj\n<< /Type /Catalog /Pages {PAGES_NUMBER} 0 R >>\nendobj\n".encode())
+
+        xref = out.tell()
+        out.write(f"xref\n0 {len(offsets)}\n0000000000 65535 f \n".encode())
+        for offset in offsets[1:]:
+            out.write(f"{offset:010d} 00000 n \n".encode())
+        out.write(f"trailer\n<< /Size {len(offsets)} /Root {CATALOG_NUMBER} 0 R >>\n"
+                  f"startxref\n{xref}\n%%EOF\n".encode())
+    return len(kids)
+
+
+def copy_pages(path, out, offsets, kids):
+    """Append the pages of the PDF at path and every object they use to out. Objects get
+    the next free numbers, offsets and kids are extended with their offsets and the
+    numbers of the pages."""
+    reader = PdfReader(path)
+    numbers = {}
+    queue = []
+
+    def renumber(ref):
+        # references made here have no reader, they are already renumbered
+        if ref.pdf is None:
+            return ref
+        if ref.idnum not in numbers:
+            numbers[ref.idnum] = len(offsets)
+            offsets.append(0)
+            queue.append(ref)
+        return IndirectObject(numbers[ref.idnum], 0, None)
+
+    def remap(obj):
+        """Point the references inside obj at the renumbered objects, in place"""
+        if isinstance(obj, IndirectObject):
+            return renumber(obj)
+        if isinstance(obj, DictionaryObject):
+            for key, value in list(dict.items(obj)):
+                # pages already point at the new page tree, which nothing else needs
+                if key != '/Parent':
+                    dict.__setitem__(obj, key, remap(value))
+        elif isinstance(obj, ArrayObject):
+            for i, value in enumerate(obj):
+                list.__setitem__(obj, i, remap(value))
+        return obj
+
+    for page in reader.pages:
+        for key in INHERITED_PAGE_KEYS:
+            if key not in page:
+                inherited = page.get_inherited(key, None)
+                if inherited is not None:
+                    page[NameObject(key)] = inherited
+        page[NameObject('/Parent')] = IndirectObject(PAGES_NUMBER, 0, None)
+        kids.append(renumber(page.indirect_reference).idnum)
+
+    while queue:
+        ref = queue.pop()
+        obj = remap(ref.get_object())
+        offsets[numbers[ref.idnum]] = out.tell()
+        out.write(f"{numbers[ref.idnum]} 0 obj\n".encode())
+        obj.write_to_stream(out)
+        out.write(b"\nendobj\n")